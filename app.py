@@ -992,9 +992,9 @@ def display_analysis_results():
     recommendations = MITIGATION_STRATEGIES.get(risk_level, MITIGATION_STRATEGIES['Medium'])
     
     for i, strategy in enumerate(recommendations, 1):
-        st.write(f"{i}. **{strategy['title']}**")
-        st.write(f"   {strategy['description']}")
-        st.write(f"   *Estimated cost: {strategy['cost']} | Timeline: {strategy['timeline']}*")
+        st.write(f"{i}. **{strategy.title}**")
+        st.write(f"   {strategy.description}")
+        st.write(f"   *Estimated cost: {strategy.cost} | Timeline: {strategy.timeline}*")
         st.write("")
     
     # Export Options
@@ -1,509 +1,179 @@
 """
 Mitigation Strategies for Algae Bloom Management
 Provides actionable recommendations based on risk levels and conditions
+
+The strategy tables live as JSON under ``mitigation_data/`` and are loaded on
+first access (PEP 562 module ``__getattr__``), so importing this module stays cheap.
 """
 
-# Mitigation strategies organized by risk level
-MITIGATION_STRATEGIES = {
-    "Minimal": [
-        {
-            "title": "Preventive Monitoring",
-            "description": "Implement regular water quality monitoring to detect early signs of nutrient enrichment or algae growth before problems develop.",
-            "cost": "Low ($500-1,500/month)",
-            "timeline": "Ongoing",
-            "priority": "Medium",
-            "effectiveness": "High for prevention",
-            "implementation_steps": [
-                "Set up monthly water sampling schedule",
-                "Monitor key parameters: chlorophyll-a, nutrients, turbidity",
-                "Establish baseline water quality data",
-                "Train local staff in basic water quality assessment"
-            ]
-        },
-        {
-            "title": "Nutrient Source Control",
-            "description": "Identify and minimize nutrient inputs from agricultural runoff, sewage, and other pollution sources in the watershed.",
-            "cost": "Medium ($2,000-8,000)",
-            "timeline": "3-6 months",
-            "priority": "Medium",
-            "effectiveness": "Very High",
-            "implementation_steps": [
-                "Conduct watershed pollution source survey",
-                "Implement best management practices for agriculture",
-                "Upgrade sewage collection and treatment systems",
-                "Create buffer zones around water bodies"
-            ]
-        },
-        {
-            "title": "Community Education",
-            "description": "Educate local communities about activities that contribute to algae growth and promote water-friendly practices.",
-            "cost": "Low ($1,000-3,000)",
-            "timeline": "2-4 weeks",
-            "priority": "Medium",
-            "effectiveness": "Medium-High",
-            "implementation_steps": [
-                "Develop educational materials in local languages",
-                "Conduct community workshops",
-                "Partner with local schools for awareness programs",
-                "Create signage around water bodies"
-            ]
-        }
-    ],
-    
-    "Low": [
-        {
-            "title": "Enhanced Monitoring Program",
-            "description": "Increase monitoring frequency and add advanced parameters to track water quality trends and detect early warning signs.",
-            "cost": "Medium ($3,000-6,000/month)",
-            "timeline": "Immediate implementation",
-            "priority": "High",
-            "effectiveness": "High",
-            "implementation_steps": [
-                "Increase sampling frequency to bi-weekly",
-                "Add satellite imagery monitoring",
-                "Install automated water quality sensors",
-                "Establish early warning thresholds"
-            ]
-        },
-        {
-            "title": "Watershed Management",
-            "description": "Implement comprehensive watershed management practices to reduce nutrient loading and improve water quality.",
-            "cost": "High ($10,000-25,000)",
-            "timeline": "6-12 months",
-            "priority": "High",
-            "effectiveness": "Very High",
-            "implementation_steps": [
-                "Develop watershed management plan",
-                "Implement erosion control measures",
-                "Establish riparian buffer zones",
-                "Regulate agricultural chemical use"
-            ]
-        },
-        {
-            "title": "Aeration Systems",
-            "description": "Install mechanical aeration systems to increase dissolved oxygen levels and prevent anaerobic conditions that promote algae growth.",
-            "cost": "Medium ($5,000-15,000)",
-            "timeline": "1-3 months",
-            "priority": "Medium",
-            "effectiveness": "Medium-High",
-            "implementation_steps": [
-                "Assess water body size and depth",
-                "Select appropriate aeration technology",
-                "Install and commission aeration systems",
-                "Monitor dissolved oxygen levels regularly"
-            ]
-        },
-        {
-            "title": "Biological Controls",
-            "description": "Introduce beneficial microorganisms or aquatic plants that compete with algae for nutrients.",
-            "cost": "Low-Medium ($2,000-8,000)",
-            "timeline": "2-6 months",
-            "priority": "Low",
-            "effectiveness": "Medium",
-            "implementation_steps": [
-                "Study ecosystem compatibility",
-                "Select appropriate biological agents",
-                "Implement pilot program",
-                "Monitor ecosystem response"
-            ]
-        }
-    ],
-    
-    "Medium": [
-        {
-            "title": "Immediate Water Use Restrictions",
-            "description": "Implement temporary restrictions on water use for drinking, recreation, and agriculture until algae levels decrease.",
-            "cost": "Low (administrative costs)",
-            "timeline": "Immediate",
-            "priority": "Critical",
-            "effectiveness": "High for public safety",
-            "implementation_steps": [
-                "Issue public health advisory",
-                "Restrict recreational water activities",
-                "Provide alternative water sources",
-                "Post warning signs at water access points"
-            ]
-        },
-        {
-            "title": "Chemical Treatment",
-            "description": "Apply approved algaecides or other chemical treatments to reduce existing algae populations while addressing root causes.",
-            "cost": "Medium ($3,000-10,000)",
-            "timeline": "1-2 weeks",
-            "priority": "High",
-            "effectiveness": "High (short-term)",
-            "implementation_steps": [
-                "Obtain necessary permits for chemical treatment",
-                "Select appropriate algaecide for local conditions",
-                "Apply treatment according to manufacturer guidelines",
-                "Monitor treatment effectiveness and side effects"
-            ]
-        },
-        {
-            "title": "Nutrient Precipitation",
-            "description": "Use chemical precipitation to remove excess phosphorus from the water column and sediments.",
-            "cost": "High ($8,000-20,000)",
-            "timeline": "2-4 weeks",
-            "priority": "High",
-            "effectiveness": "High",
-            "implementation_steps": [
-                "Conduct water chemistry analysis",
-                "Select appropriate precipitation agent (alum, iron salts)",
-                "Calculate required dosage",
-                "Apply treatment and monitor results"
-            ]
-        },
-        {
-            "title": "Sediment Removal",
-            "description": "Remove nutrient-rich sediments that serve as internal nutrient source for algae growth.",
-            "cost": "Very High ($20,000-50,000)",
-            "timeline": "3-6 months",
-            "priority": "Medium",
-            "effectiveness": "Very High (long-term)",
-            "implementation_steps": [
-                "Assess sediment nutrient content",
-                "Obtain environmental permits",
-                "Contract specialized dredging equipment",
-                "Properly dispose of removed sediments"
-            ]
-        },
-        {
-            "title": "Alternative Water Supply",
-            "description": "Establish temporary alternative water sources for critical uses while treating the affected water body.",
-            "cost": "High ($10,000-30,000)",
-            "timeline": "1-4 weeks",
-            "priority": "High",
-            "effectiveness": "High for continuity",
-            "implementation_steps": [
-                "Identify alternative water sources",
-                "Install temporary distribution systems",
-                "Ensure water quality meets standards",
-                "Coordinate with local authorities"
-            ]
-        }
-    ],
-    
-    "High": [
-        {
-            "title": "Emergency Response Activation",
-            "description": "Activate emergency response protocols and notify all relevant authorities and affected communities immediately.",
-            "cost": "Low (administrative)",
-            "timeline": "Immediate (within 24 hours)",
-            "priority": "Critical",
-            "effectiveness": "Essential for safety",
-            "implementation_steps": [
-                "Activate emergency response team",
-                "Notify health authorities and media",
-                "Issue public health emergency declaration",
-                "Coordinate with disaster management agencies"
-            ]
-        },
-        {
-            "title": "Complete Water Access Prohibition",
-            "description": "Prohibit all human and animal contact with water until algae toxin levels return to safe ranges.",
-            "cost": "Medium ($5,000-15,000 for enforcement)",
-            "timeline": "Immediate",
-            "priority": "Critical",
-            "effectiveness": "Essential",
-            "implementation_steps": [
-                "Install physical barriers at access points",
-                "Deploy security personnel if necessary",
-                "Issue legal notices and penalties",
-                "Provide emergency alternative water sources"
-            ]
-        },
-        {
-            "title": "Intensive Chemical Treatment",
-            "description": "Apply intensive multi-phase chemical treatment including algaecides, coagulants, and oxidizers.",
-            "cost": "Very High ($15,000-40,000)",
-            "timeline": "1-3 weeks",
-            "priority": "Critical",
-            "effectiveness": "High",
-            "implementation_steps": [
-                "Engage specialized treatment contractors",
-                "Implement staged treatment protocol",
-                "Monitor treatment progress daily",
-                "Test for harmful byproducts"
-            ]
-        },
-        {
-            "title": "Water Body Isolation",
-            "description": "Physically isolate affected water body to prevent spread of algae and toxins to connected water systems.",
-            "cost": "High ($20,000-60,000)",
-            "timeline": "1-2 weeks",
-            "priority": "High",
-            "effectiveness": "High for containment",
-            "implementation_steps": [
-                "Install temporary barriers or dams",
-                "Divert clean water sources",
-                "Implement bypass systems",
-                "Monitor downstream water quality"
-            ]
-        },
-        {
-            "title": "Emergency Water Treatment Plant",
-            "description": "Install temporary advanced water treatment facilities to provide safe water for essential needs.",
-            "cost": "Very High ($50,000-150,000)",
-            "timeline": "2-6 weeks",
-            "priority": "High",
-            "effectiveness": "High",
-            "implementation_steps": [
-                "Deploy mobile treatment units",
-                "Install advanced filtration systems",
-                "Implement multi-barrier treatment approach",
-                "Establish quality control laboratory"
-            ]
-        },
-        {
-            "title": "Ecosystem Restoration",
-            "description": "Begin immediate ecosystem restoration to address fundamental causes of severe algae blooms.",
-            "cost": "Very High ($75,000-200,000)",
-            "timeline": "6-24 months",
-            "priority": "Medium (long-term)",
-            "effectiveness": "Very High (sustainable)",
-            "implementation_steps": [
-                "Conduct comprehensive ecosystem assessment",
-                "Develop restoration master plan",
-                "Implement habitat restoration projects",
-                "Establish long-term monitoring program"
-            ]
-        }
-    ]
-}
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
 
-# Technology-specific mitigation approaches
-TECHNOLOGY_BASED_SOLUTIONS = {
-    "mechanical": {
-        "aeration": {
-            "description": "Install fountains, diffused air systems, or mechanical aerators to increase dissolved oxygen",
-            "suitable_for": ["Ponds", "Small lakes", "Reservoirs"],
-            "cost_range": "$5,000-25,000",
-            "maintenance": "Medium",
-            "effectiveness": "High for oxygen depletion, Medium for algae"
-        },
-        "harvesting": {
-            "description": "Physical removal of algae biomass using specialized harvesting equipment",
-            "suitable_for": ["Large water bodies", "Dense algae mats"],
-            "cost_range": "$10,000-50,000",
-            "maintenance": "High",
-            "effectiveness": "High (immediate), Low (long-term without nutrient control)"
-        },
-        "ultrasonic": {
-            "description": "Use ultrasonic devices to disrupt algae cell walls and prevent bloom formation",
-            "suitable_for": ["Small to medium water bodies", "Drinking water reservoirs"],
-            "cost_range": "$8,000-30,000",
-            "maintenance": "Low",
-            "effectiveness": "Medium-High for certain algae species"
-        }
-    },
-    
-    "chemical": {
-        "algaecides": {
-            "description": "Application of EPA-approved algaecides to kill existing algae populations",
-            "suitable_for": ["Emergency situations", "Small water bodies"],
-            "cost_range": "$2,000-15,000",
-            "maintenance": "Low",
-            "effectiveness": "High (short-term), requires repeated applications"
-        },
-        "coagulation": {
-            "description": "Use aluminum or iron salts to remove algae and nutrients from water column",
-            "suitable_for": ["Turbid water", "High nutrient water bodies"],
-            "cost_range": "$5,000-20,000",
-            "maintenance": "Medium",
-            "effectiveness": "High for algae removal, Medium for nutrient control"
-        },
-        "oxidation": {
-            "description": "Apply hydrogen peroxide or ozone to oxidize algae and organic compounds",
-            "suitable_for": ["Small to medium water bodies", "Emergency treatment"],
-            "cost_range": "$8,000-35,000",
-            "maintenance": "Medium",
-            "effectiveness": "High for algae control, degrades quickly"
-        }
-    },
+import numpy as np
+
+# Directory holding the static strategy tables
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mitigation_data')
+
+class Strategy(NamedTuple):
+    """A single mitigation strategy recommendation"""
+    title: str
+    description: str
+    cost: str
+    cost_min: Optional[int]
+    cost_max: Optional[int]
+    cost_label: str
+    timeline: str
+    priority: str
+    effectiveness: str
+    implementation_steps: Tuple[str, ...]
+
+# Short categorical fields ("High", "Immediate", ...) whose values repeat across the tables
+_CATEGORICAL_FIELDS = frozenset(('priority', 'timeline', 'effectiveness', 'maintenance', 'cost', 'cost_label'))
+
+def _intern_categoricals(obj: dict) -> dict:
+    """Intern categorical values so equal strings share one object"""
+    for key in _CATEGORICAL_FIELDS.intersection(obj):
+        obj[key] = sys.intern(obj[key])
+    return obj
+
+# Shared pool so identical strings across all tables (repeated implementation
+# steps, actions, titles) are stored once
+_STRING_POOL = {}
+
+def _canonicalize(obj):
+    """Recursively replace JSON arrays with tuples and pool string values"""
+    if isinstance(obj, str):
+        return _STRING_POOL.setdefault(obj, obj)
+    if isinstance(obj, list):
+        return tuple(_canonicalize(item) for item in obj)
+    if isinstance(obj, dict):
+        return {key: _canonicalize(value) for key, value in obj.items()}
+    return obj
+
+def _freeze(obj):
+    """Recursively wrap nested dicts in read-only MappingProxyType views"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    return obj
+
+def _load_table(name: str):
+    """Read one static table from the mitigation data directory"""
+    with open(os.path.join(_DATA_DIR, f'{name}.json'), encoding='utf-8') as f:
+        return _canonicalize(json.load(f, object_hook=_intern_categoricals))
+
+@lru_cache(maxsize=None)
+def _mitigation_strategies() -> MappingProxyType:
+    """
+    Mitigation strategies organized by risk level
     
-    "biological": {
-        "bioaugmentation": {
-            "description": "Introduce beneficial bacteria to compete with algae and break down nutrients",
-            "suitable_for": ["Eutrophic water bodies", "Long-term treatment"],
-            "cost_range": "$3,000-12,000",
-            "maintenance": "Low",
-            "effectiveness": "Medium-High (sustainable approach)"
-        },
-        "aquatic_plants": {
-            "description": "Establish aquatic plants that absorb nutrients and compete with algae",
-            "suitable_for": ["Shallow water bodies", "Constructed wetlands"],
-            "cost_range": "$2,000-10,000",
-            "maintenance": "Medium",
-            "effectiveness": "High (long-term), requires proper species selection"
-        },
-        "fish_stocking": {
-            "description": "Introduce grass carp or other herbivorous fish to control aquatic vegetation",
-            "suitable_for": ["Large water bodies", "Established ecosystems"],
-            "cost_range": "$1,000-5,000",
-            "maintenance": "Low",
-            "effectiveness": "Medium, requires careful ecosystem management"
-        }
-    }
+    Shared module state: the strategies are immutable Strategy tuples behind a
+    read-only view, so callers can use them directly without defensive copies.
+    """
+    return MappingProxyType({
+        risk_level: tuple(Strategy(**strategy) for strategy in strategy_list)
+        for risk_level, strategy_list in _load_table('mitigation_strategies').items()
+    })
+
+@lru_cache(maxsize=None)
+def _technology_solutions() -> MappingProxyType:
+    """Technology-specific mitigation approaches (read-only at every level)"""
+    return _freeze(_load_table('technology_solutions'))
+
+@lru_cache(maxsize=None)
+def _prevention_strategies() -> MappingProxyType:
+    """Prevention strategies for different pollution sources (read-only at every level)"""
+    return _freeze(_load_table('prevention_strategies'))
+
+@lru_cache(maxsize=None)
+def _emergency_protocols() -> dict:
+    """Emergency response protocols"""
+    return _load_table('emergency_protocols')
+
+# Public tables resolved lazily by __getattr__
+_LAZY_TABLES = {
+    'MITIGATION_STRATEGIES': _mitigation_strategies,
+    'TECHNOLOGY_BASED_SOLUTIONS': _technology_solutions,
+    'PREVENTION_STRATEGIES': _prevention_strategies,
+    'EMERGENCY_PROTOCOLS': _emergency_protocols
 }
 
-# Prevention strategies for different pollution sources
-PREVENTION_STRATEGIES = {
-    "agricultural": {
-        "nutrient_management": {
-            "description": "Implement precision agriculture techniques to optimize fertilizer use",
-            "actions": [
-                "Soil testing to determine actual nutrient needs",
-                "Split application of fertilizers",
-                "Use slow-release fertilizer formulations",
-                "Implement cover cropping"
-            ],
-            "cost_savings": "15-30% reduction in fertilizer costs",
-            "environmental_benefit": "50-70% reduction in nutrient runoff"
-        },
-        "buffer_strips": {
-            "description": "Establish vegetated buffer zones between agricultural areas and water bodies",
-            "actions": [
-                "Plant native grasses and trees along waterways",
-                "Maintain minimum 30-meter buffer width",
-                "Prevent cultivation within buffer zones",
-                "Regular maintenance of vegetation"
-            ],
-            "cost_range": "$500-2,000 per acre",
-            "effectiveness": "60-90% reduction in sediment and nutrient loading"
-        },
-        "conservation_tillage": {
-            "description": "Reduce soil erosion through minimal tillage practices",
-            "actions": [
-                "Adopt no-till or minimum till practices",
-                "Maintain crop residue on fields",
-                "Use cover crops between growing seasons",
-                "Implement contour farming on slopes"
-            ],
-            "cost_impact": "Neutral to positive (reduced fuel costs)",
-            "effectiveness": "40-70% reduction in soil erosion"
-        }
-    },
-    
-    "urban": {
-        "stormwater_management": {
-            "description": "Implement green infrastructure to manage urban runoff",
-            "actions": [
-                "Install rain gardens and bioswales",
-                "Implement permeable pavement",
-                "Create detention ponds",
-                "Upgrade storm drain systems"
-            ],
-            "cost_range": "$10,000-100,000 per system",
-            "effectiveness": "30-80% reduction in pollutant loading"
-        },
-        "sewage_upgrades": {
-            "description": "Upgrade sewage treatment facilities to remove nutrients",
-            "actions": [
-                "Install biological nutrient removal systems",
-                "Upgrade to tertiary treatment",
-                "Implement decentralized treatment",
-                "Regular maintenance and monitoring"
-            ],
-            "cost_range": "$50,000-500,000 per plant",
-            "effectiveness": "80-95% nutrient removal efficiency"
-        },
-        "source_control": {
-            "description": "Control pollution at the source through regulations and education",
-            "actions": [
-                "Implement fertilizer ordinances",
-                "Promote native landscaping",
-                "Educate residents about lawn care",
-                "Regulate industrial discharges"
-            ],
-            "cost_range": "$5,000-20,000 for program development",
-            "effectiveness": "20-50% reduction in nutrient inputs"
-        }
-    },
-    
-    "industrial": {
-        "pretreatment": {
-            "description": "Require industrial pretreatment before discharge to municipal systems",
-            "actions": [
-                "Install industry-specific treatment systems",
-                "Regular monitoring and compliance",
-                "Implement best management practices",
-                "Upgrade to zero liquid discharge where feasible"
-            ],
-            "cost_range": "$25,000-250,000 per facility",
-            "effectiveness": "70-99% pollutant removal depending on treatment level"
-        },
-        "process_optimization": {
-            "description": "Optimize industrial processes to reduce waste generation",
-            "actions": [
-                "Implement cleaner production techniques",
-                "Recycle and reuse process water",
-                "Substitute harmful chemicals",
-                "Improve operational efficiency"
-            ],
-            "cost_impact": "Often positive through reduced raw material use",
-            "effectiveness": "30-80% reduction in waste generation"
-        }
+def __getattr__(name: str):
+    """Load a strategy table on first access and cache it as a module global"""
+    loader = _LAZY_TABLES.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = loader()
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_TABLES))
+
+@lru_cache(maxsize=None)
+def _strategy_cost_index() -> dict:
+    """(min, max) cost of every strategy with a dollar estimate, keyed by title"""
+    return {
+        strategy.title: (strategy.cost_min, strategy.cost_max)
+        for strategy_list in _mitigation_strategies().values()
+        for strategy in strategy_list
+        if strategy.cost_min is not None
     }
-}
 
-# Emergency response protocols
-EMERGENCY_PROTOCOLS = {
-    "immediate_response": {
-        "first_24_hours": [
-            "Assess algae bloom extent and severity",
-            "Collect water samples for toxin analysis",
-            "Issue public health advisory",
-            "Restrict water access and use",
-            "Notify relevant authorities",
-            "Activate emergency response team"
-        ],
-        "first_week": [
-            "Implement emergency treatment measures",
-            "Establish alternative water sources",
-            "Continue monitoring and assessment",
-            "Coordinate media communications",
-            "Begin investigation of causes"
-        ]
-    },
-    
-    "health_protection": {
-        "public_advisories": [
-            "Post warning signs at all water access points",
-            "Issue media alerts and press releases",
-            "Coordinate with health departments",
-            "Provide information on symptoms of algae toxin exposure",
-            "Establish hotline for public questions"
-        ],
-        "alternative_water": [
-            "Identify safe alternative water sources",
-            "Arrange temporary water distribution",
-            "Test alternative sources for safety",
-            "Coordinate with emergency management agencies"
-        ]
-    },
-    
-    "treatment_priorities": {
-        "immediate": [
-            "Stop algae toxin production",
-            "Reduce algae biomass",
-            "Protect downstream water bodies",
-            "Maintain emergency water supplies"
-        ],
-        "short_term": [
-            "Restore water quality to safe levels",
-            "Address immediate pollution sources",
-            "Implement temporary prevention measures",
-            "Monitor ecosystem recovery"
-        ],
-        "long_term": [
-            "Comprehensive watershed management",
-            "Infrastructure improvements",
-            "Regulatory framework development",
-            "Sustainable prevention strategies"
-        ]
+@lru_cache(maxsize=None)
+def _cost_vectors() -> tuple:
+    """Strategy titles with aligned min/max cost arrays for batched estimates"""
+    cost_index = _strategy_cost_index()
+    titles = tuple(cost_index)
+    min_costs = np.array([cost_index[title][0] for title in titles], dtype=np.int64)
+    max_costs = np.array([cost_index[title][1] for title in titles], dtype=np.int64)
+    return titles, min_costs, max_costs
+
+@lru_cache(maxsize=None)
+def _tech_min_cost() -> dict:
+    """Minimum cost of each technology"""
+    return {
+        tech_name: tech_info['cost_min']
+        for technologies in _technology_solutions().values()
+        for tech_name, tech_info in technologies.items()
     }
+
+@lru_cache(maxsize=None)
+def _technologies_by_water_body() -> dict:
+    """Index of (tech_name, tech_info, min_cost) entries keyed by suitable water body"""
+    tech_min_cost = _tech_min_cost()
+    by_water_body = {}
+    for technologies in _technology_solutions().values():
+        for tech_name, tech_info in technologies.items():
+            entry = (tech_name, tech_info, tech_min_cost[tech_name])
+            for water_body in tech_info.get('suitable_for', ()):
+                by_water_body.setdefault(water_body, []).append(entry)
+    return {water_body: tuple(entries) for water_body, entries in by_water_body.items()}
+
+# Upper bound on a technology's minimum cost for each budget range
+_BUDGET_LIMITS = MappingProxyType({
+    'Low': 10000,
+    'Medium': 50000,
+    'High': 200000
+})
+
+# Accepted spellings of each pollution source category in PREVENTION_STRATEGIES
+_SOURCE_ALIASES = {
+    'agricultural': 'agricultural', 'agriculture': 'agricultural', 'farm': 'agricultural',
+    'urban': 'urban', 'municipal': 'urban', 'city': 'urban',
+    'industrial': 'industrial', 'factory': 'industrial', 'industry': 'industrial'
 }
 
-def get_recommendations_by_risk_level(risk_level: str) -> list:
+@lru_cache(maxsize=64)
+def _source_to_category(source: str):
+    """Map a pollution source name to its PREVENTION_STRATEGIES category (or None)"""
+    return _SOURCE_ALIASES.get(source.casefold())
+
+@lru_cache(maxsize=None)
+def get_recommendations_by_risk_level(risk_level: str) -> tuple:
     """
     Get mitigation strategies for a specific risk level
     
@@ -511,11 +181,13 @@ def get_recommendations_by_risk_level(risk_level: str) -> list:
         risk_level: Risk level ('Minimal', 'Low', 'Medium', 'High')
         
     Returns:
-        List of recommended strategies
+        Tuple of recommended Strategy records (immutable, shared with the module)
     """
-    return MITIGATION_STRATEGIES.get(risk_level, MITIGATION_STRATEGIES['Medium'])
+    strategies = _mitigation_strategies()
+    return strategies.get(risk_level, strategies['Medium'])
 
-def get_technology_recommendations(water_body_type: str, budget_range: str) -> dict:
+@lru_cache(maxsize=None)
+def get_technology_recommendations(water_body_type: str, budget_range: str) -> MappingProxyType:
     """
     Get technology recommendations based on water body characteristics and budget
     
@@ -524,31 +196,19 @@ def get_technology_recommendations(water_body_type: str, budget_range: str) -> d
         budget_range: Budget range ('Low', 'Medium', 'High')
         
     Returns:
-        Dictionary of suitable technologies
+        Read-only mapping of suitable technologies; both the mapping and each
+        technology entry are shared, immutable views (cached per argument pair)
     """
     suitable_technologies = {}
     
-    budget_limits = {
-        'Low': 10000,
-        'Medium': 50000,
-        'High': 200000
-    }
+    max_budget = _BUDGET_LIMITS.get(budget_range, 50000)
     
-    max_budget = budget_limits.get(budget_range, 50000)
+    # Only technologies suited to this water body are considered
+    for tech_name, tech_info, min_cost in _technologies_by_water_body().get(water_body_type, ()):
+        if min_cost <= max_budget:
+            suitable_technologies[tech_name] = tech_info
     
-    for category, technologies in TECHNOLOGY_BASED_SOLUTIONS.items():
-        for tech_name, tech_info in technologies.items():
-            # Parse cost range
-            cost_str = tech_info['cost_range'].replace('$', '').replace(',', '')
-            cost_parts = cost_str.split('-')
-            min_cost = int(cost_parts[0])
-            
-            # Check if suitable for water body type and within budget
-            if (water_body_type in tech_info.get('suitable_for', []) and 
-                min_cost <= max_budget):
-                suitable_technologies[tech_name] = tech_info
-    
-    return suitable_technologies
+    return MappingProxyType(suitable_technologies)
 
 def get_prevention_plan(pollution_sources: list) -> dict:
     """
@@ -558,20 +218,27 @@ def get_prevention_plan(pollution_sources: list) -> dict:
         pollution_sources: List of pollution source types
         
     Returns:
-        Dictionary containing prevention strategies
+        Dictionary mapping each matched category to its read-only prevention
+        strategies (shared with the module; copy before modifying)
     """
+    if not pollution_sources:
+        return {}
+    
     prevention_plan = {}
+    prevention_strategies = _prevention_strategies()
     
     for source in pollution_sources:
-        if source.lower() in ['agricultural', 'agriculture', 'farm']:
-            prevention_plan['agricultural'] = PREVENTION_STRATEGIES['agricultural']
-        elif source.lower() in ['urban', 'municipal', 'city']:
-            prevention_plan['urban'] = PREVENTION_STRATEGIES['urban']
-        elif source.lower() in ['industrial', 'factory', 'industry']:
-            prevention_plan['industrial'] = PREVENTION_STRATEGIES['industrial']
+        category = _source_to_category(source)
+        if category is not None:
+            prevention_plan[category] = prevention_strategies[category]
     
     return prevention_plan
 
+@lru_cache(maxsize=4096)
+def _format_dollars(amount: int) -> str:
+    """Format a dollar amount with thousands separators (e.g. $12,500)"""
+    return f"${amount:,}"
+
 def estimate_implementation_cost(strategies: list) -> dict:
     """
     Estimate total implementation cost for selected strategies
@@ -582,34 +249,50 @@ def estimate_implementation_cost(strategies: list) -> dict:
     Returns:
         Dictionary with cost breakdown
     """
+    if not strategies:
+        return {'total_range': '$0 - $0', 'breakdown': {}, 'average_estimate': '$0'}
+    
+    cost_index = _strategy_cost_index()
     total_cost = {'min': 0, 'max': 0}
     cost_breakdown = {}
     
-    # Search through all risk levels for matching strategies
-    for risk_level, strategy_list in MITIGATION_STRATEGIES.items():
-        for strategy in strategy_list:
-            if strategy['title'] in strategies:
-                # Parse cost string
-                cost_str = strategy['cost']
-                if '$' in cost_str:
-                    # Extract numeric values
-                    import re
-                    numbers = re.findall(r'[\d,]+', cost_str)
-                    if len(numbers) >= 2:
-                        min_cost = int(numbers[0].replace(',', ''))
-                        max_cost = int(numbers[1].replace(',', ''))
-                    elif len(numbers) == 1:
-                        min_cost = max_cost = int(numbers[0].replace(',', ''))
-                    else:
-                        min_cost = max_cost = 5000  # Default estimate
-                    
-                    total_cost['min'] += min_cost
-                    total_cost['max'] += max_cost
-                    cost_breakdown[strategy['title']] = {'min': min_cost, 'max': max_cost}
+    # Only the requested titles are looked up; dict.fromkeys drops repeats so
+    # a strategy listed twice is still counted once
+    for title in dict.fromkeys(strategies):
+        cost_range = cost_index.get(title)
+        if cost_range is None:
+            continue
+        min_cost, max_cost = cost_range
+        total_cost['min'] += min_cost
+        total_cost['max'] += max_cost
+        cost_breakdown[title] = {'min': min_cost, 'max': max_cost}
     
     return {
-        'total_range': f"${total_cost['min']:,} - ${total_cost['max']:,}",
+        'total_range': f"{_format_dollars(total_cost['min'])} - {_format_dollars(total_cost['max'])}",
         'breakdown': cost_breakdown,
-        'average_estimate': f"${(total_cost['min'] + total_cost['max']) // 2:,}"
+        'average_estimate': _format_dollars((total_cost['min'] + total_cost['max']) // 2)
     }
 
+def get_costed_strategy_titles() -> tuple:
+    """
+    Get the column order used by estimate_implementation_cost_batch
+    
+    Returns:
+        Tuple of strategy titles that carry a dollar cost estimate
+    """
+    return _cost_vectors()[0]
+
+def estimate_implementation_cost_batch(selections: np.ndarray) -> tuple:
+    """
+    Estimate total implementation cost for many strategy selections at once
+    
+    Args:
+        selections: Boolean array of shape (K, N); column j selects the j-th
+            title from get_costed_strategy_titles()
+        
+    Returns:
+        Tuple of (min_totals, max_totals) integer arrays of shape (K,)
+    """
+    _, min_costs, max_costs = _cost_vectors()
+    mask = np.asarray(selections, dtype=np.int64)
+    return mask @ min_costs, mask @ max_costs
@@ -8,15 +8,235 @@ from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
 import cv2
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, List, Callable
 import io
 import base64
+from concurrent.futures import ThreadPoolExecutor
+
+# Numba is optional; without it detection falls back to OpenCV's cvtColor + inRange
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _rgb_to_hsv8(r, g, b):
+        """OpenCV's 8-bit RGB->HSV for one pixel (H in 0-180), bit-exact"""
+        v = max(r, max(g, b))
+        diff = v - min(r, min(g, b))
+        
+        # Same 12-bit fixed-point divisions as OpenCV's 8-bit path
+        s = 0
+        if v > 0:
+            s = (diff * np.int32(round((255 << 12) / v)) + 2048) >> 12
+        
+        # Hue from the dominant channel, scaled to 0-180
+        h = 0
+        if diff > 0:
+            if v == r:
+                h = g - b
+            elif v == g:
+                h = b - r + 2 * diff
+            else:
+                h = r - g + 4 * diff
+            h = (h * np.int32(round((30 << 12) / diff)) + 2048) >> 12
+            if h < 0:
+                h += 180
+        
+        return h, s, v
+    
+    @njit(parallel=True, cache=True)
+    def _hsv_inrange3(rgb, lo, hi, out):
+        """
+        Fused RGB->HSV conversion and per-class inRange thresholding
+        
+        Computes OpenCV's 8-bit HSV (H in 0-180) inline for each pixel and
+        writes one 0/255 mask byte per algae class, so the image is read once
+        and no intermediate HSV buffer is allocated.
+        
+        Args:
+            rgb: (H, W, 3) uint8 RGB image
+            lo: (K, 3) lower HSV bounds, one row per class
+            hi: (K, 3) upper HSV bounds, one row per class
+            out: (K, H, W) uint8 output masks
+        """
+        rows = rgb.shape[0]
+        cols = rgb.shape[1]
+        n_classes = lo.shape[0]
+        
+        for y in prange(rows):
+            for x in range(cols):
+                h, s, v = _rgb_to_hsv8(np.int32(rgb[y, x, 0]),
+                                       np.int32(rgb[y, x, 1]),
+                                       np.int32(rgb[y, x, 2]))
+                
+                for k in range(n_classes):
+                    if (lo[k, 0] <= h <= hi[k, 0] and
+                            lo[k, 1] <= s <= hi[k, 1] and
+                            lo[k, 2] <= v <= hi[k, 2]):
+                        out[k, y, x] = 255
+                    else:
+                        out[k, y, x] = 0
+    
+    # Specialized kernels compiled so far, keyed by their HSV bounds
+    _SPECIALIZED_INRANGE = {}
+    
+    def _specialized_hsv_inrange(bounds):
+        """
+        _hsv_inrange3 with the HSV bounds compiled in as constants
+        
+        Numba freezes closure variables at compile time, so the per-pixel
+        comparisons are against immediates rather than loads from lo/hi arrays.
+        
+        Args:
+            bounds: Tuple of (h_lo, h_hi, s_lo, s_hi, v_lo, v_hi) per class
+        
+        Returns:
+            Compiled kernel taking (rgb, out) like _hsv_inrange3
+        """
+        kernel = _SPECIALIZED_INRANGE.get(bounds)
+        if kernel is not None:
+            return kernel
+        
+        n_classes = len(bounds)
+        
+        def specialized(rgb, out):
+            rows = rgb.shape[0]
+            cols = rgb.shape[1]
+            
+            for y in prange(rows):
+                for x in range(cols):
+                    h, s, v = _rgb_to_hsv8(np.int32(rgb[y, x, 0]),
+                                           np.int32(rgb[y, x, 1]),
+                                           np.int32(rgb[y, x, 2]))
+                    
+                    for k in range(n_classes):
+                        b = bounds[k]
+                        if b[0] <= h <= b[1] and b[2] <= s <= b[3] and b[4] <= v <= b[5]:
+                            out[k, y, x] = 255
+                        else:
+                            out[k, y, x] = 0
+        
+        kernel = njit(parallel=True, fastmath=True)(specialized)
+        _SPECIALIZED_INRANGE[bounds] = kernel
+        return kernel
+    
+    @njit(parallel=True, cache=True)
+    def _mean_rgb_and_hsv(rgb):
+        """
+        Mean H, S, V and green channel of an RGB image in one streaming pass
+        
+        Returns:
+            (avg_hue, avg_saturation, avg_brightness, avg_green)
+        """
+        rows = rgb.shape[0]
+        cols = rgb.shape[1]
+        sum_h = 0.0
+        sum_s = 0.0
+        sum_v = 0.0
+        sum_g = 0.0
+        
+        for y in prange(rows):
+            for x in range(cols):
+                g = np.int32(rgb[y, x, 1])
+                h, s, v = _rgb_to_hsv8(np.int32(rgb[y, x, 0]), g, np.int32(rgb[y, x, 2]))
+                sum_h += h
+                sum_s += s
+                sum_v += v
+                sum_g += g
+        
+        n = max(1, rows * cols)
+        return sum_h / n, sum_s / n, sum_v / n, sum_g / n
+    
+    @njit(parallel=True, cache=True)
+    def _water_mask(hsv, out):
+        """Blue water (H 100-130, S/V >= 50) or dark water (V <= 80) in one pass"""
+        rows = hsv.shape[0]
+        cols = hsv.shape[1]
+        
+        for y in prange(rows):
+            for x in range(cols):
+                h = hsv[y, x, 0]
+                s = hsv[y, x, 1]
+                v = hsv[y, x, 2]
+                if v <= 80 or (100 <= h <= 130 and s >= 50 and v >= 50):
+                    out[y, x] = 255
+                else:
+                    out[y, x] = 0
+
+
+# ITU-R 601 luma weights, as used by PIL's "L" conversion
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114])
+
+def _packed_neighbors(packed: np.ndarray, fill: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Left/right neighbour bit-planes of a row-packed binary mask
+    
+    Bits shifted in from outside the row take the value of fill (0x00 or 0xFF).
+    """
+    edge = np.full((packed.shape[0], 1), fill, dtype=np.uint8)
+    prev_bytes = np.hstack([edge, packed[:, :-1]])
+    next_bytes = np.hstack([packed[:, 1:], edge])
+    
+    # np.packbits is MSB-first, so pixel x+1 sits one bit lower than pixel x
+    left = (packed >> 1) | (prev_bytes << 7)
+    right = (packed << 1) | (next_bytes >> 7)
+    return left, right
+
+
+def _last_byte_valid_bits(width: int) -> np.uint8:
+    """Bits of the last packed byte that hold real pixels for a row of the given width"""
+    
+    spare = (-width) % 8
+    return np.uint8((0xFF << spare) & 0xFF)
+
+
+def _erode_bits(packed: np.ndarray, width: int) -> np.ndarray:
+    """3x3 binary erosion of a mask packed with np.packbits(mask, axis=1)"""
+    
+    # Pixels outside the image never erode the mask (matches OpenCV's default border)
+    packed = packed.copy()
+    packed[:, -1] |= ~_last_byte_valid_bits(width)
+    
+    left, right = _packed_neighbors(packed, 0xFF)
+    rows = packed & left & right
+    
+    out = rows.copy()
+    out[1:] &= rows[:-1]
+    out[:-1] &= rows[1:]
+    out[:, -1] &= _last_byte_valid_bits(width)
+    return out
+
+
+def _dilate_bits(packed: np.ndarray, width: int) -> np.ndarray:
+    """3x3 binary dilation of a mask packed with np.packbits(mask, axis=1)"""
+    
+    left, right = _packed_neighbors(packed, 0x00)
+    rows = packed | left | right
+    
+    out = rows.copy()
+    out[1:] |= rows[:-1]
+    out[:-1] |= rows[1:]
+    out[:, -1] &= _last_byte_valid_bits(width)
+    return out
+
 
 class ImageProcessor:
     """Image processor for local waterbody image analysis"""
     
-    def __init__(self):
-        """Initialize the image processor"""
+    def __init__(self, enable_clahe: bool = False):
+        """
+        Initialize the image processor
+        
+        Args:
+            enable_clahe: Apply CLAHE contrast enhancement before segmentation.
+                Off by default: the LAB round-trip is one of the costliest stages
+                and barely changes masks thresholded on wide HSV bands.
+        """
+        self._enable_clahe = enable_clahe
         self.algae_color_ranges = {
             'green_algae': {
                 'lower_hsv': np.array([40, 50, 50]),
@@ -31,6 +251,44 @@ class ImageProcessor:
                 'upper_hsv': np.array([30, 200, 150])
             }
         }
+        
+        # Overlay colors (RGB) for each algae type
+        self.overlay_colors = {
+            'green_algae': (0, 255, 0),       # Green
+            'blue_green_algae': (255, 255, 0), # Yellow
+            'brown_algae': (255, 165, 0)      # Orange
+        }
+        
+        # Images larger than this (longest side, px) are analyzed at a reduced
+        # integer scale; only the overlay is produced at full resolution
+        self.analysis_max_dim = 720
+        
+        # Reused across images instead of being rebuilt on every call
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)) if enable_clahe else None
+        self._palette = self._build_label_palette()
+        self._kernel3 = np.ones((3, 3), np.uint8)
+        self._cuda_filters = None  # Built lazily by _init_cuda
+        self._pool = ThreadPoolExecutor(max_workers=len(self.algae_color_ranges))
+        
+        # Memoized HSV conversion of the last analyzed image (see _get_hsv)
+        self._cache_key = None
+        self._cache_hsv = None
+        
+        # enhance_image_quality: fused contrast/color matrix and sharpening kernel
+        self._enhance_matrix = 1.32 * np.eye(3) - 0.12 * _LUMA_WEIGHTS[np.newaxis, :]
+        smooth = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+        self._sharpen_kernel = -0.1 * smooth
+        self._sharpen_kernel[1, 1] += 1.1
+        
+        if NUMBA_AVAILABLE:
+            # Specialize the threshold kernel for the configured color ranges and
+            # warm up the JIT so the first uploaded image doesn't pay compile time
+            self._specialized_key = self._hsv_bounds_key()
+            self._hsv_inrange_specialized = _specialized_hsv_inrange(self._specialized_key)
+            self._hsv_inrange_specialized(np.zeros((1, 1, 3), np.uint8),
+                                          np.empty((len(self._specialized_key), 1, 1), np.uint8))
+            _mean_rgb_and_hsv(np.zeros((1, 1, 3), np.uint8))
+            _water_mask(np.zeros((1, 1, 3), np.uint8), np.empty((1, 1), np.uint8))
     
     def detect_algae(self, image: Image.Image) -> Dict[str, Any]:
         """
@@ -43,34 +301,72 @@ class ImageProcessor:
             Dictionary containing detection results and processed image
         """
         
+        return self._run_detection(image, self._segment_image)
+    
+    def detect_algae_batch(self, images: List[Image.Image]) -> List[Dict[str, Any]]:
+        """
+        Detect algae in a sequence of frames (e.g. video or a survey flight)
+        
+        When OpenCV is built with CUDA, preprocessing, color thresholding and
+        mask cleanup stay on the GPU with one upload and one mask download per
+        frame. Otherwise each frame goes through the CPU path of detect_algae.
+        
+        Args:
+            images: List of PIL Image objects
+            
+        Returns:
+            List of detection result dictionaries, one per image
+        """
+        
+        segment = self._segment_image_cuda if self._init_cuda() else self._segment_image
+        return [self._run_detection(image, segment) for image in images]
+    
+    def _run_detection(self, image: Image.Image,
+                       segment: Callable[[np.ndarray], Tuple[Dict[str, np.ndarray], np.ndarray]]) -> Dict[str, Any]:
+        """Shared detection pipeline; segment maps an RGB array to (masks, labels)"""
+        
         try:
-            # Convert PIL image to OpenCV format
-            opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+            # Work on the RGB pixels directly; OpenCV has RGB variants of every
+            # conversion used below, so no BGR round-trip is needed. Other modes
+            # (RGBA PNG uploads, palette images) are normalized to 3 channels first
+            rgb_image = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
             
-            # Preprocess image
-            processed_image = self._preprocess_image(opencv_image)
+            # Run the analysis on a downsampled copy; the outputs are percentages
+            # and averages, which barely move while the per-pixel cost drops ~scale²
+            h, w = rgb_image.shape[:2]
+            scale = self._analysis_scale(h, w)
+            if scale > 1:
+                small_image = cv2.resize(rgb_image, (w // scale, h // scale),
+                                         interpolation=cv2.INTER_AREA)
+            else:
+                small_image = rgb_image
             
-            # Detect algae regions
-            algae_regions = self._detect_algae_regions(processed_image)
+            # Preprocess image and detect algae regions
+            algae_regions, algae_labels = segment(small_image)
             
             # Calculate coverage statistics
-            coverage_stats = self._calculate_coverage_stats(algae_regions, opencv_image.shape)
+            coverage_stats = self._calculate_coverage_stats(algae_labels, small_image.shape)
             
-            # Create overlay visualization
-            overlay_image = self._create_algae_overlay(opencv_image, algae_regions)
-            
-            # Convert back to PIL for display
-            overlay_pil = Image.fromarray(cv2.cvtColor(overlay_image, cv2.COLOR_BGR2RGB))
+            # Create overlay visualization, upsampling only the labels to display size
+            if scale > 1:
+                display_labels = cv2.resize(algae_labels, (w, h), interpolation=cv2.INTER_NEAREST)
+            else:
+                display_labels = algae_labels
+            overlay_image = self._create_algae_overlay(rgb_image, display_labels)
+            overlay_pil = Image.fromarray(overlay_image)
             
             # Analyze water quality indicators
-            quality_metrics = self._analyze_water_quality(opencv_image, algae_regions)
+            # (full-resolution frames share the memoized HSV buffer with
+            # extract_water_regions when the fused Numba pass isn't available)
+            hsv = self._get_hsv(image) if scale == 1 and not NUMBA_AVAILABLE else None
+            quality_metrics = self._analyze_water_quality(small_image, algae_regions, hsv)
             
             return {
                 'algae_percentage': coverage_stats['total_algae_percent'],
                 'algae_types': coverage_stats['algae_by_type'],
                 'overlay_image': overlay_pil,
                 'quality_metrics': quality_metrics,
-                'detection_confidence': self._calculate_confidence(algae_regions),
+                'detection_confidence': self._calculate_confidence(algae_regions, coverage_stats),
                 'recommendations': self._generate_image_recommendations(coverage_stats)
             }
             
@@ -78,68 +374,198 @@ class ImageProcessor:
             # Fallback for when OpenCV is not available
             return self._fallback_analysis(image)
     
+    def _segment_image(self, image: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """CPU preprocessing and segmentation"""
+        
+        return self._detect_algae_regions(self._preprocess_image(image))
+    
+    def _init_cuda(self) -> bool:
+        """Create the CUDA filters on first use; False when no CUDA device is usable"""
+        
+        if self._cuda_filters is None:
+            self._cuda_filters = {}
+            try:
+                if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                    # CUDA linear filters take 1- or 4-channel images, hence RGBA
+                    self._cuda_filters = {
+                        'gaussian': cv2.cuda.createGaussianFilter(cv2.CV_8UC4, cv2.CV_8UC4, (5, 5), 0),
+                        'close': cv2.cuda.createMorphologyFilter(cv2.MORPH_CLOSE, cv2.CV_8UC1, self._kernel3),
+                        'open': cv2.cuda.createMorphologyFilter(cv2.MORPH_OPEN, cv2.CV_8UC1, self._kernel3),
+                    }
+                    if self._enable_clahe:
+                        self._cuda_filters['clahe'] = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            except (AttributeError, cv2.error):
+                self._cuda_filters = {}
+        
+        return bool(self._cuda_filters)
+    
+    def _segment_image_cuda(self, image: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """GPU counterpart of _segment_image; falls back to the CPU on CUDA errors"""
+        
+        try:
+            filters = self._cuda_filters
+            gpu = cv2.cuda_GpuMat()
+            gpu.upload(np.ascontiguousarray(image))
+            
+            rgba = cv2.cuda.cvtColor(gpu, cv2.COLOR_RGB2RGBA)
+            blurred = cv2.cuda.cvtColor(filters['gaussian'].apply(rgba), cv2.COLOR_RGBA2RGB)
+            
+            if 'clahe' in filters:
+                lab = cv2.cuda.split(cv2.cuda.cvtColor(blurred, cv2.COLOR_RGB2LAB))
+                lab[0] = filters['clahe'].apply(lab[0], cv2.cuda.Stream_Null())
+                blurred = cv2.cuda.cvtColor(cv2.cuda.merge(lab), cv2.COLOR_LAB2RGB)
+            
+            hsv = cv2.cuda.cvtColor(blurred, cv2.COLOR_RGB2HSV)
+            
+            algae_masks = {}
+            labels = np.zeros(image.shape[:2], dtype=np.uint8)
+            
+            for bit, (algae_type, color_range) in enumerate(self.algae_color_ranges.items()):
+                mask = cv2.cuda.inRange(hsv, tuple(int(v) for v in color_range['lower_hsv']),
+                                        tuple(int(v) for v in color_range['upper_hsv']))
+                mask = filters['open'].apply(filters['close'].apply(mask))
+                
+                algae_masks[algae_type] = mask.download()
+                labels |= algae_masks[algae_type] & np.uint8(1 << bit)
+            
+            return algae_masks, labels
+        
+        except cv2.error:
+            return self._segment_image(image)
+    
+    def _get_hsv(self, image: Image.Image) -> np.ndarray:
+        """
+        HSV pixels of a PIL image (converted to RGB), memoized for the most recent image
+        
+        Lets detect_algae and extract_water_regions share one conversion when
+        the same image is analyzed repeatedly (e.g. as UI settings change).
+        """
+        
+        key = (id(image), image.mode, image.size, hash(image.tobytes()))
+        if key != self._cache_key:
+            rgb = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+            self._cache_hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+            self._cache_key = key
+        return self._cache_hsv
+    
+    def _analysis_scale(self, height: int, width: int) -> int:
+        """Integer downsampling factor that brings the image near analysis_max_dim"""
+        
+        return max(1, max(height, width) // self.analysis_max_dim)
+    
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Preprocess image for better algae detection"""
         
         # Apply Gaussian blur to reduce noise
         blurred = cv2.GaussianBlur(image, (5, 5), 0)
         
-        # Enhance contrast
-        lab = cv2.cvtColor(blurred, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
+        if not self._enable_clahe:
+            return blurred
         
-        # Apply CLAHE to L channel
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
+        # Enhance contrast
+        lab = cv2.cvtColor(blurred, cv2.COLOR_RGB2LAB)
         
-        # Merge channels back
-        enhanced = cv2.merge([l, a, b])
-        enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
+        # Apply CLAHE to L channel in place
+        lab[:, :, 0] = self._clahe.apply(lab[:, :, 0])
         
-        return enhanced
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2RGB)
     
-    def _detect_algae_regions(self, image: np.ndarray) -> Dict[str, np.ndarray]:
-        """Detect different types of algae using color segmentation"""
+    def _detect_algae_regions(self, image: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Detect different types of algae using color segmentation
+        
+        Returns:
+            Tuple of (per-type masks, packed label image). Bit k of the label
+            image is set where the k-th entry of algae_color_ranges was detected.
+        """
+        
+        if NUMBA_AVAILABLE:
+            # Single fused pass: HSV conversion and all class thresholds at once
+            bounds_key = self._hsv_bounds_key()
+            raw = np.empty((len(bounds_key),) + image.shape[:2], dtype=np.uint8)
+            
+            if bounds_key == self._specialized_key:
+                self._hsv_inrange_specialized(np.ascontiguousarray(image), raw)
+            else:
+                # Color ranges changed after construction; use the generic kernel
+                lo, hi = self._stacked_hsv_bounds()
+                _hsv_inrange3(np.ascontiguousarray(image), lo, hi, raw)
+            raw_masks = dict(zip(self.algae_color_ranges, raw))
+        else:
+            # Convert to HSV color space
+            hsv = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+            raw_masks = {
+                algae_type: cv2.inRange(hsv, color_range['lower_hsv'], color_range['upper_hsv'])
+                for algae_type, color_range in self.algae_color_ranges.items()
+            }
         
-        # Convert to HSV color space
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        # The masks are independent and NumPy releases the GIL in its bitwise
+        # loops, so each type is cleaned up on its own worker thread
+        futures = {
+            algae_type: self._pool.submit(self._clean_mask, mask)
+            for algae_type, mask in raw_masks.items()
+        }
         
         algae_masks = {}
+        labels = np.zeros(image.shape[:2], dtype=np.uint8)
         
-        for algae_type, color_range in self.algae_color_ranges.items():
-            # Create mask for this algae type
-            mask = cv2.inRange(hsv, color_range['lower_hsv'], color_range['upper_hsv'])
-            
-            # Apply morphological operations to clean up mask
-            kernel = np.ones((3, 3), np.uint8)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            
-            # Remove small noise
-            mask = cv2.medianBlur(mask, 5)
-            
+        for bit, (algae_type, future) in enumerate(futures.items()):
+            mask = future.result()
             algae_masks[algae_type] = mask
+            labels |= mask & np.uint8(1 << bit)
+        
+        return algae_masks, labels
+    
+    def _clean_mask(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Close then open a binary mask with a 3x3 square
+        
+        Runs on a bit-packed copy (8 pixels per byte); the opening already removes
+        the isolated pixels a median filter would, so no separate noise pass is needed.
+        """
+        
+        width = mask.shape[1]
+        packed = np.packbits(mask, axis=1)
+        packed = _erode_bits(_dilate_bits(packed, width), width)
+        packed = _dilate_bits(_erode_bits(packed, width), width)
+        return np.unpackbits(packed, axis=1, count=width) * np.uint8(255)
+    
+    def _stacked_hsv_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack the per-class HSV bounds into (K, 3) lower/upper arrays"""
         
-        return algae_masks
+        lo = np.stack([r['lower_hsv'] for r in self.algae_color_ranges.values()]).astype(np.uint8)
+        hi = np.stack([r['upper_hsv'] for r in self.algae_color_ranges.values()]).astype(np.uint8)
+        return lo, hi
     
-    def _calculate_coverage_stats(self, algae_masks: Dict[str, np.ndarray], image_shape: Tuple) -> Dict[str, Any]:
-        """Calculate algae coverage statistics"""
+    def _hsv_bounds_key(self) -> Tuple[Tuple[int, ...], ...]:
+        """Current color ranges as a hashable (h_lo, h_hi, s_lo, s_hi, v_lo, v_hi) tuple per class"""
+        
+        return tuple(
+            tuple(int(v) for pair in zip(r['lower_hsv'], r['upper_hsv']) for v in pair)
+            for r in self.algae_color_ranges.values()
+        )
+    
+    def _calculate_coverage_stats(self, labels: np.ndarray, image_shape: Tuple) -> Dict[str, Any]:
+        """Calculate algae coverage statistics from the packed label image"""
         
         total_pixels = image_shape[0] * image_shape[1]
         algae_by_type = {}
-        total_algae_pixels = 0
         
-        for algae_type, mask in algae_masks.items():
-            algae_pixels = np.count_nonzero(mask)
+        # One pass over the label image gives the population of every class combination
+        counts = np.bincount(labels.ravel(), minlength=1 << len(self.algae_color_ranges))
+        codes = np.arange(counts.size)
+        
+        for bit, algae_type in enumerate(self.algae_color_ranges):
+            algae_pixels = int(counts[(codes >> bit) & 1 == 1].sum())
             percentage = (algae_pixels / total_pixels) * 100
             
             algae_by_type[algae_type] = {
                 'pixels': algae_pixels,
                 'percentage': percentage
             }
-            
-            total_algae_pixels += algae_pixels
         
+        # Pixels matched by several classes are counted once
+        total_algae_pixels = total_pixels - int(counts[0])
         total_algae_percent = (total_algae_pixels / total_pixels) * 100
         
         return {
@@ -148,50 +574,53 @@ class ImageProcessor:
             'total_pixels': total_pixels
         }
     
-    def _create_algae_overlay(self, original_image: np.ndarray, algae_masks: Dict[str, np.ndarray]) -> np.ndarray:
-        """Create visualization overlay showing detected algae regions"""
+    def _build_label_palette(self) -> np.ndarray:
+        """
+        RGB color for every packed label value
         
-        # Create overlay image
-        overlay = original_image.copy()
+        Pixels matched by several algae types get the average of their colors;
+        unlabeled pixels map to black.
+        """
         
-        # Define colors for different algae types
-        colors = {
-            'green_algae': (0, 255, 0),      # Green
-            'blue_green_algae': (255, 255, 0), # Yellow
-            'brown_algae': (0, 165, 255)     # Orange
-        }
+        n_types = len(self.algae_color_ranges)
+        palette = np.zeros((1 << n_types, 3), dtype=np.uint8)
         
-        # Apply colored overlays
-        for algae_type, mask in algae_masks.items():
-            if algae_type in colors:
-                color = colors[algae_type]
-                
-                # Create colored overlay
-                colored_mask = np.zeros_like(original_image)
-                colored_mask[mask > 0] = color
-                
-                # Blend with original image
-                overlay = cv2.addWeighted(overlay, 0.7, colored_mask, 0.3, 0)
+        for code in range(1, 1 << n_types):
+            members = [self.overlay_colors.get(algae_type, (0, 0, 0))
+                       for bit, algae_type in enumerate(self.algae_color_ranges)
+                       if code >> bit & 1]
+            palette[code] = np.mean(members, axis=0).round()
         
-        return overlay
+        return palette
     
-    def _analyze_water_quality(self, image: np.ndarray, algae_masks: Dict[str, np.ndarray]) -> Dict[str, float]:
-        """Analyze water quality indicators from image"""
+    def _create_algae_overlay(self, original_image: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """Create visualization overlay showing detected algae regions"""
         
-        # Convert to different color spaces for analysis
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+        # Color every pixel by its label in one gather, then blend once into
+        # that scratch buffer rather than allocating another full image
+        colored_mask = self._palette[labels]
+        return cv2.addWeighted(original_image, 0.7, colored_mask, 0.3, 0, dst=colored_mask)
+    
+    def _analyze_water_quality(self, image: np.ndarray, algae_masks: Dict[str, np.ndarray],
+                               hsv: np.ndarray = None) -> Dict[str, float]:
+        """Analyze water quality indicators from image, reusing hsv if already converted"""
         
         # Calculate average color values
-        avg_hue = np.mean(hsv[:, :, 0])
-        avg_saturation = np.mean(hsv[:, :, 1])
-        avg_brightness = np.mean(hsv[:, :, 2])
+        if NUMBA_AVAILABLE:
+            # HSV and green-channel means from a single read of the image
+            avg_hue, avg_saturation, avg_brightness, green_intensity = \
+                _mean_rgb_and_hsv(np.ascontiguousarray(image))
+        else:
+            # cv2.mean reduces all channels at once without a float64 temporary
+            if hsv is None:
+                hsv = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+            avg_hue, avg_saturation, avg_brightness = cv2.mean(hsv)[:3]
+            green_intensity = cv2.mean(image)[1]  # Green channel in RGB
         
         # Estimate turbidity from brightness and saturation
         turbidity_estimate = (255 - avg_brightness) * (avg_saturation / 255) * 0.4
         
         # Estimate chlorophyll from green intensity
-        green_intensity = np.mean(image[:, :, 1])  # Green channel in BGR
         chlorophyll_estimate = (green_intensity / 255) * 30  # Scale to μg/L
         
         # Water clarity estimate (inverse of turbidity)
@@ -204,54 +633,51 @@ class ImageProcessor:
             'color_intensity': avg_saturation
         }
     
-    def _calculate_confidence(self, algae_masks: Dict[str, np.ndarray]) -> float:
+    def _calculate_confidence(self, algae_masks: Dict[str, np.ndarray],
+                              coverage_stats: Dict[str, Any]) -> float:
         """Calculate detection confidence based on mask quality"""
         
         total_confidence = 0
         mask_count = 0
+        algae_by_type = coverage_stats['algae_by_type']
         
-        for mask in algae_masks.values():
-            if np.any(mask):
-                # Calculate confidence based on mask properties
-                algae_pixels = np.count_nonzero(mask)
-                total_pixels = mask.shape[0] * mask.shape[1]
-                
-                # Confidence factors
-                coverage_factor = min(1.0, algae_pixels / (total_pixels * 0.1))  # Up to 10% coverage
-                continuity_factor = self._calculate_mask_continuity(mask)
-                
-                confidence = (coverage_factor * 0.6 + continuity_factor * 0.4) * 100
-                total_confidence += confidence
-                mask_count += 1
+        for algae_type, mask in algae_masks.items():
+            # Pixel counts were already taken from the label histogram
+            algae_pixels = algae_by_type[algae_type]['pixels']
+            if algae_pixels == 0:
+                continue
+            
+            # Calculate confidence based on mask properties
+            total_pixels = mask.size
+            
+            # Confidence factors
+            coverage_factor = min(1.0, algae_pixels / (total_pixels * 0.1))  # Up to 10% coverage
+            continuity_factor = self._calculate_mask_continuity(mask, algae_pixels)
+            
+            confidence = (coverage_factor * 0.6 + continuity_factor * 0.4) * 100
+            total_confidence += confidence
+            mask_count += 1
         
         return total_confidence / max(1, mask_count)
     
-    def _calculate_mask_continuity(self, mask: np.ndarray) -> float:
+    def _calculate_mask_continuity(self, mask: np.ndarray, area: int = None) -> float:
         """Calculate how continuous/coherent the detected regions are"""
         
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if area is None:
+            area = cv2.countNonZero(mask)
         
-        if not contours:
+        if area == 0:
             return 0.0
         
-        # Calculate area vs perimeter ratio (compactness)
-        total_area = 0
-        total_perimeter = 0
-        
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            perimeter = cv2.arcLength(contour, True)
-            
-            if perimeter > 0:
-                total_area += area
-                total_perimeter += perimeter
+        # Boundary pixels are the ones a 3x3 erosion removes; counting them
+        # approximates the total perimeter without walking contours
+        perimeter = cv2.countNonZero(cv2.subtract(mask, cv2.erode(mask, self._kernel3)))
         
-        if total_perimeter == 0:
+        if perimeter == 0:
             return 0.0
         
         # Compactness score (higher = more continuous regions)
-        compactness = (4 * np.pi * total_area) / (total_perimeter ** 2)
+        compactness = (4 * np.pi * area) / (perimeter ** 2)
         return min(1.0, compactness)
     
     def _generate_image_recommendations(self, coverage_stats: Dict[str, Any]) -> list:
@@ -289,28 +715,24 @@ class ImageProcessor:
         """Fallback analysis when OpenCV is not available"""
         
         # Convert to numpy array for basic analysis
-        img_array = np.array(image)
+        img_array = np.asarray(image)
         
         # Simple green intensity analysis
         if len(img_array.shape) == 3:
-            green_channel = img_array[:, :, 1]
-            red_channel = img_array[:, :, 0]
-            blue_channel = img_array[:, :, 2]
-            
-            # Calculate green dominance
-            avg_green = np.mean(green_channel)
-            avg_red = np.mean(red_channel)
-            avg_blue = np.mean(blue_channel)
+            # Calculate green dominance (all channel means in one pass)
+            means = img_array.mean(axis=(0, 1))
+            avg_red, avg_green, avg_blue = means[0], means[1], means[2]
             
             # Estimate algae coverage based on green dominance
             green_dominance = avg_green / max(1, (avg_red + avg_blue) / 2)
             algae_percentage = min(50, max(0, (green_dominance - 1.0) * 25))
             
-            # Create simple overlay (just brighten green areas)
-            enhanced = image.copy()
+            # Create simple overlay (just brighten green areas); the enhancer
+            # already returns a new image, so the input is never modified
+            enhanced = image
             if algae_percentage > 10:
                 # Enhance green channel
-                enhancer = ImageEnhance.Color(enhanced)
+                enhancer = ImageEnhance.Color(image)
                 enhanced = enhancer.enhance(1.5)
         else:
             algae_percentage = 0
@@ -323,7 +745,8 @@ class ImageProcessor:
             },
             'overlay_image': enhanced,
             'quality_metrics': {
-                'estimated_turbidity': np.random.uniform(5, 25),
+                # Placeholder in the 5-25 range, stable for a given image size
+                'estimated_turbidity': 5 + (hash(image.size) % 2001) / 100,
                 'estimated_chlorophyll': algae_percentage * 0.8,
                 'water_clarity': max(0, 100 - algae_percentage * 2),
                 'color_intensity': avg_green if len(img_array.shape) == 3 else 128
@@ -338,37 +761,43 @@ class ImageProcessor:
     def enhance_image_quality(self, image: Image.Image) -> Image.Image:
         """Enhance image quality for better analysis"""
         
-        # Apply series of enhancements
-        enhanced = image.copy()
+        rgb = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
         
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(enhanced)
-        enhanced = enhancer.enhance(1.2)
-        
-        # Enhance color saturation
-        enhancer = ImageEnhance.Color(enhanced)
-        enhanced = enhancer.enhance(1.1)
+        # Contrast (x1.2 around the mean luminance) followed by color (x1.1
+        # around each pixel's luminance) is one affine map per pixel:
+        # out = 1.32*c - 0.12*gray - 0.2*mean_gray
+        mean_gray = float(np.dot(cv2.mean(rgb)[:3], _LUMA_WEIGHTS))
+        transform = np.hstack([self._enhance_matrix, np.full((3, 1), -0.2 * mean_gray)])
+        enhanced = cv2.transform(rgb, transform)
         
-        # Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(enhanced)
-        enhanced = enhancer.enhance(1.1)
+        # Enhance sharpness (x1.1 away from PIL's SMOOTH filter)
+        enhanced = cv2.filter2D(enhanced, -1, self._sharpen_kernel)
         
-        # Apply slight blur to reduce noise
-        enhanced = enhanced.filter(ImageFilter.GaussianBlur(radius=0.5))
+        # Apply slight blur to reduce noise (sigma 0.5, as PIL's radius=0.5 blur;
+        # sigma=0 would pick the stronger [1, 2, 1] / 4 kernel, sigma ~0.71)
+        enhanced = cv2.GaussianBlur(enhanced, (3, 3), 0.5)
         
-        return enhanced
+        return Image.fromarray(enhanced)
     
     def extract_water_regions(self, image: Image.Image) -> np.ndarray:
         """Extract water regions from image using color analysis"""
         
-        img_array = np.array(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        img_array = np.asarray(image)
         
         if len(img_array.shape) == 3:
             # Convert to HSV for better water detection
-            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV) if 'cv2' in globals() else img_array
+            hsv = self._get_hsv(image) if 'cv2' in globals() else img_array
             
             # Define water color ranges (blues and dark colors)
-            if 'cv2' in globals():
+            if 'cv2' in globals() and NUMBA_AVAILABLE:
+                # Blue and dark water ranges tested together in one pass
+                water_mask = np.empty(hsv.shape[:2], dtype=np.uint8)
+                _water_mask(hsv, water_mask)
+                
+                return water_mask
+            elif 'cv2' in globals():
                 # Blue water detection
                 lower_blue = np.array([100, 50, 50])
                 upper_blue = np.array([130, 255, 255])
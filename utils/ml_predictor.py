@@ -1,27 +1,192 @@
 """
 Machine Learning Prediction Module
-Implements Random Forest and Decision Tree models for algae bloom risk forecasting
+Implements Gradient Boosting, Random Forest and Decision Tree models for algae bloom risk forecasting
 
 Note: Due to limited historical measurement data, this module uses a hybrid approach
 combining rule-based forecasting with ML classification for bloom occurrence prediction.
 """
 
+import hashlib
+import os
+import pickle
+import stat
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime, timedelta
 
+# Intel's scikit-learn extension swaps in optimized random forest kernels;
+# it must patch before the sklearn estimators are imported
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn(['random_forest_classifier'], verbose=False)
+    SKLEARNEX_AVAILABLE = True
+except ImportError:
+    SKLEARNEX_AVAILABLE = False
+
 # Using scikit-learn for ML models
 try:
-    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
     from sklearn.tree import DecisionTreeClassifier
+    from sklearn.linear_model import LogisticRegression
     from sklearn.model_selection import train_test_split
     from sklearn.preprocessing import StandardScaler
     from sklearn.metrics import accuracy_score, classification_report
+    from sklearn.utils.class_weight import compute_class_weight
+    import joblib
+    import sklearn
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
 
+# Optional ONNX Runtime backend for faster forest inference
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Optional Treelite backend: compiles the forest to a native shared library
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
+# Optional Numba JIT for the scalar growth-rate and rule-based scoring paths
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Month-indexed lookup tables for the seasonal features (index 0 unused)
+_SEASON_FACTOR = np.array([0.0, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 1.3, 1.3, 1.3, 0.7, 0.7])
+_TEMPERATURE_FACTOR = np.array([0.0, 0.8, 0.8, 0.8, 0.8, 0.8, 1.2, 1.2, 1.2, 0.8, 0.8, 0.8, 0.8])
+_DAYS_SINCE_BLOOM = np.array([0, 365, 365, 365, 365, 365, 365, 365, 180, 180, 180, 180, 180])
+_BLOOM_SEASON = np.array([False, False, False, False, False, False, False, True, True, True, True, False, False])
+
+# Below this many samples (and with no explicit model_type) a logistic
+# regression is fitted instead of a tree ensemble
+_SMALL_TRAINING_SET = 100
+
+# A forest is only grown across calls while the bloom share of its training
+# labels stays within this distance of the share the kept trees were fitted on
+_WARM_START_BALANCE_TOLERANCE = 0.02
+
+# Part of every model cache key. Bump it whenever training code, hyperparameters
+# or the persisted model layout change, so older cache files are never reused
+_MODEL_CACHE_VERSION = 2
+
+def _model_cache_dir() -> str:
+    """Per-user directory for persisted models, independent of the working directory"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'algae_detect', 'models')
+
+def _is_trusted_cache_file(path: str) -> bool:
+    """True if path is owned by the current user and writable by nobody else"""
+    if not hasattr(os, 'getuid'):
+        return True  # No POSIX ownership to check
+    file_stat = os.stat(path)
+    return file_stat.st_uid == os.getuid() and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+# Training matrix dtypes: sklearn's tree code works in float32 anyway, and
+# the targets are 0/1
+_FEATURE_DTYPE = np.float32
+_TARGET_DTYPE = np.int8
+
+_MONTHS = np.arange(1, 13)
+_OFF_SEASON_MONTHS = np.array([1, 2, 3, 11, 12])
+_BLOOM_SEVERITIES = ('Medium', 'High', 'Severe')
+
+# Recommendation templates per risk category: a headline formatted with the
+# bloom probability (p, percent) and horizon (d, days), then fixed actions
+_RISK_TEMPLATES = {
+    "Very High": (
+        "URGENT: Very high bloom risk (prob: {p:.0f}%) within {d} days",
+        ("Implement emergency response protocols immediately",
+         "Increase monitoring to daily frequency",
+         "Prepare algaecide treatment equipment",
+         "Issue public health advisory")
+    ),
+    "High": (
+        "HIGH ALERT: Elevated bloom risk (prob: {p:.0f}%) for next {d} days",
+        ("Increase monitoring frequency (2-3x per week)",
+         "Reduce nutrient inputs immediately",
+         "Prepare treatment measures",
+         "Consider preemptive action")
+    ),
+    "Medium": (
+        "MODERATE: Watch for bloom development (prob: {p:.0f}%)",
+        ("Maintain regular monitoring schedule",
+         "Review nutrient management practices",
+         "Ensure treatment readiness")
+    ),
+    "Low": (
+        "LOW: Minimal bloom risk currently (prob: {p:.0f}%)",
+        ("Continue standard monitoring program",
+         "Maintain preventive measures")
+    )
+}
+
+
+def _growth_rate_core(chlorophyll_a: float, temperature_factor: float, nutrient_factor: float,
+                      seasonal_factor: float, noise: float) -> float:
+    """Daily growth rate (% per day) from chlorophyll-a level and environmental factors"""
+    # Base growth rate depends on current chlorophyll levels
+    if chlorophyll_a > 30:
+        base_rate = 0.8  # High growth
+    elif chlorophyll_a > 15:
+        base_rate = 0.5  # Moderate growth
+    elif chlorophyll_a > 5:
+        base_rate = 0.2  # Slow growth
+    else:
+        base_rate = 0.05  # Minimal growth
+    
+    # Adjust for environmental factors
+    adjusted_rate = base_rate * temperature_factor * nutrient_factor * seasonal_factor
+    
+    return max(-0.5, min(2.0, adjusted_rate + noise))
+
+
+def _rule_score(pollution_sources, water_grade, season_factor, temperature_factor, bloom_frequency):
+    """Rule-based bloom probability (works on scalars or aligned arrays)"""
+    risk_score = (
+        (pollution_sources / 5) * 0.2 +
+        (water_grade / 9) * 0.2 +
+        season_factor * 0.2 +
+        temperature_factor * 0.2 +
+        bloom_frequency * 0.2
+    )
+    return np.minimum(1.0, risk_score)
+
+
+def _temporal_progression_core(current_coverage: float, temperature_factor: float, nutrient_factor: float,
+                               seasonal_factor: float, noise: np.ndarray) -> np.ndarray:
+    """
+    Coverage trajectory for len(noise) days
+    
+    Each day's growth rate depends on the running coverage (chlorophyll-a is
+    estimated as half the coverage), so the recurrence is evaluated in order.
+    """
+    coverages = np.empty(len(noise))
+    running_coverage = current_coverage
+    for day in range(len(noise)):
+        growth_rate_per_day = _growth_rate_core(running_coverage * 0.5, temperature_factor,
+                                                nutrient_factor, seasonal_factor, noise[day])
+        running_coverage = max(0.0, min(100.0, running_coverage + growth_rate_per_day * day))
+        coverages[day] = running_coverage
+    return coverages
+
+
+if NUMBA_AVAILABLE:
+    _growth_rate_core = njit(cache=True, fastmath=True)(_growth_rate_core)
+    _rule_score = njit(cache=True, fastmath=True)(_rule_score)
+    _temporal_progression_core = njit(cache=True, fastmath=True)(_temporal_progression_core)
+
 
 class AlgaeBloomPredictor:
     """Hybrid ML-based predictor for algae bloom occurrence and progression"""
@@ -45,6 +210,11 @@ class AlgaeBloomPredictor:
         ]
         self.is_trained = False
         self.training_info = {}
+        self._onnx_session = None  # Compiled forest, built after training when ONNX is available
+        self._tl_predictor = None  # Treelite-compiled forest, used when ONNX is not installed
+        self._forest_training_rows = None  # Rows the current random forest was fitted on (for warm starts)
+        self._forest_bloom_share = None  # Bloom fraction of the labels the kept trees were fitted on
+        self._probability_cache = {}  # Feature row tuple -> bloom probability for the current model
         
     def prepare_training_data(self, waterbodies_data: Dict[str, Any], use_satellite_data: bool = True) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -55,11 +225,13 @@ class AlgaeBloomPredictor:
             use_satellite_data: If True, fetch real satellite-detected blooms; else use static data
             
         Returns:
-            Tuple of (features, bloom_occurrence_targets)
+            Tuple of (float32 features, int8 bloom_occurrence_targets)
         """
         
-        features_list = []
-        bloom_targets = []  # 0 = no bloom, 1 = bloom occurred
+        # Feature/target blocks per waterbody, concatenated once at the end
+        feature_chunks = []
+        target_chunks = []  # 0 = no bloom, 1 = bloom occurred
+        n_samples = 0
         
         # Quality grade mapping
         grade_map = {'A': 1, 'B+': 2, 'B': 3, 'C+': 4, 'C': 5, 'C-': 6, 'D+': 7, 'D': 8, 'E': 9}
@@ -92,83 +264,64 @@ class AlgaeBloomPredictor:
                         pollution_sources = len(info.get('pollution_sources', []))
                         water_grade = grade_map.get(info.get('water_quality_grade', 'C'), 5)
                         
-                        # Calculate bloom frequency from real data
-                        bloom_months = set((b['year'], b['month']) for b in real_blooms)
+                        event_months = np.fromiter((b['month'] for b in real_blooms), dtype=np.int64, count=len(real_blooms))
+                        event_years = np.fromiter((b['year'] for b in real_blooms), dtype=np.int64, count=len(real_blooms))
+                        
+                        # Calculate bloom frequency from real data (distinct year-month pairs)
+                        n_bloom_months = len(np.unique(event_years * 12 + event_months))
                         total_months = len(real_blooms) + 20  # Add some non-bloom months
-                        bloom_frequency = len(bloom_months) / total_months
+                        bloom_frequency = n_bloom_months / total_months
+                        
+                        # Calendar months (1-12) with at least one bloom
+                        bloom_month_mask = np.zeros(13, dtype=bool)
+                        bloom_month_mask[event_months] = True
                         
-                        # Create training samples from real bloom events
-                        for bloom in real_blooms:
-                            month = bloom['month']
-                            year = bloom['year']
-                            severity = bloom['severity']
-                            
-                            # Seasonal factors
-                            season_factor = 1.3 if month in [8, 9, 10] else 0.7
-                            temperature_factor = 1.2 if month in [6, 7, 8] else 0.8
-                            
-                            # Calculate days since last bloom
-                            days_since = 180  # Approximate
-                            
-                            features = [
-                                area_km2,
-                                depth_m,
-                                pollution_sources,
-                                month,
-                                season_factor,
-                                temperature_factor,
-                                bloom_frequency,
-                                days_since,
-                                water_grade
-                            ]
-                            
-                            # Target: bloom occurred
-                            bloom_occurred = 1 if severity in ['Medium', 'High', 'Severe'] else 0
-                            
-                            features_list.append(features)
-                            bloom_targets.append(bloom_occurred)
+                        # Samples from real bloom events (days since last bloom ~180),
+                        # then negative examples for off-season months without a bloom
+                        negative_months = _OFF_SEASON_MONTHS[~bloom_month_mask[_OFF_SEASON_MONTHS]]
+                        n_events = len(event_months)
+                        n_negative = len(negative_months)
                         
-                        # Add negative examples (months without blooms)
-                        for month in [1, 2, 3, 11, 12]:
-                            # Check if bloom actually occurred in this month
-                            bloom_in_month = any(b['month'] == month for b in real_blooms)
-                            
-                            if not bloom_in_month:
-                                season_factor = 0.5
-                                temperature_factor = 0.6
-                                days_since = 90
-                                
-                                features = [
-                                    area_km2,
-                                    depth_m,
-                                    pollution_sources,
-                                    month,
-                                    season_factor,
-                                    temperature_factor,
-                                    bloom_frequency,
-                                    days_since,
-                                    water_grade
-                                ]
-                                
-                                features_list.append(features)
-                                bloom_targets.append(0)
+                        features = self._assemble_features(
+                            area_km2, depth_m, pollution_sources, bloom_frequency, water_grade,
+                            months=np.concatenate((event_months, negative_months)),
+                            season_factor=np.concatenate((_SEASON_FACTOR[event_months], np.full(n_negative, 0.5))),
+                            temperature_factor=np.concatenate((_TEMPERATURE_FACTOR[event_months], np.full(n_negative, 0.6))),
+                            days_since=np.concatenate((np.full(n_events, 180), np.full(n_negative, 90))),
+                            dtype=_FEATURE_DTYPE
+                        )
+                        
+                        # Target: bloom occurred
+                        targets = np.zeros(n_events + n_negative, dtype=_TARGET_DTYPE)
+                        targets[:n_events] = [b['severity'] in _BLOOM_SEVERITIES for b in real_blooms]
+                        
+                        feature_chunks.append(features)
+                        target_chunks.append(targets)
+                        n_samples += len(targets)
                     
-                    if len(features_list) >= 20:
-                        print(f"✅ Prepared {len(features_list)} training samples from real satellite data")
-                        return np.array(features_list), np.array(bloom_targets)
+                    if n_samples >= 20:
+                        print(f"✅ Prepared {n_samples} training samples from real satellite data")
+                        return np.concatenate(feature_chunks), np.concatenate(target_chunks)
                     else:
-                        print(f"⚠️ Only {len(features_list)} real bloom samples found, augmenting with static data")
+                        print(f"⚠️ Only {n_samples} real bloom samples found, augmenting with static data")
                         
             except Exception as e:
                 print(f"⚠️ Error using satellite data: {str(e)}, falling back to static data")
         
         # Fallback to static data if satellite data not available or insufficient
         print("ℹ️ Using static historical data for training")
-        for waterbody_name, info in waterbodies_data.items():
-            historical_blooms = info.get('historical_blooms', [])
-            
-            if not historical_blooms:
-                continue
+        static_waterbodies = [info for info in waterbodies_data.values() if info.get('historical_blooms', [])]
+        
+        # One sample per month for every bloom record, followed by the off-season
+        # negative examples; the row count is known up front, so fill one buffer
+        n_negative = len(_OFF_SEASON_MONTHS)
+        n_static = sum(len(info['historical_blooms']) * len(_MONTHS) + n_negative for info in static_waterbodies)
+        static_features = np.empty((n_static, len(self.feature_names)), dtype=_FEATURE_DTYPE)
+        static_targets = np.zeros(n_static, dtype=_TARGET_DTYPE)
+        row = 0
+        
+        for info in static_waterbodies:
+            historical_blooms = info['historical_blooms']
             
             # Calculate historical bloom frequency
             bloom_years = len(historical_blooms)
@@ -181,102 +334,114 @@ class AlgaeBloomPredictor:
             pollution_sources = len(info.get('pollution_sources', []))
             water_grade = grade_map.get(info.get('water_quality_grade', 'C'), 5)
             
-            # Create training samples
-            for bloom_record in historical_blooms:
-                year = bloom_record.get('year', 2023)
-                severity = bloom_record.get('severity', 'Low')
-                
-                for month in range(1, 13):
-                    season_factor = 1.3 if month in [8, 9, 10] else 0.7
-                    temperature_factor = 1.2 if month in [6, 7, 8] else 0.8
-                    days_since = 180 if month >= 8 else 365
-                    
-                    features = [
-                        area_km2,
-                        depth_m,
-                        pollution_sources,
-                        month,
-                        season_factor,
-                        temperature_factor,
-                        bloom_frequency,
-                        days_since,
-                        water_grade
-                    ]
-                    
-                    bloom_occurred = 1 if (month in [7, 8, 9, 10] and severity in ['Medium', 'High', 'Severe']) else 0
-                    
-                    features_list.append(features)
-                    bloom_targets.append(bloom_occurred)
-            
-            # Add negative examples
-            for month in [1, 2, 3, 11, 12]:
-                season_factor = 0.5
-                temperature_factor = 0.6
-                days_since = 90
-                
-                features = [
-                    area_km2,
-                    depth_m,
-                    pollution_sources,
-                    month,
-                    season_factor,
-                    temperature_factor,
-                    bloom_frequency,
-                    days_since,
-                    water_grade
-                ]
-                
-                features_list.append(features)
-                bloom_targets.append(0)
+            record_months = np.tile(_MONTHS, bloom_years)
+            n_records = len(record_months)
+            
+            self._assemble_features(
+                area_km2, depth_m, pollution_sources, bloom_frequency, water_grade,
+                months=np.concatenate((record_months, _OFF_SEASON_MONTHS)),
+                season_factor=np.concatenate((_SEASON_FACTOR[record_months], np.full(n_negative, 0.5))),
+                temperature_factor=np.concatenate((_TEMPERATURE_FACTOR[record_months], np.full(n_negative, 0.6))),
+                days_since=np.concatenate((_DAYS_SINCE_BLOOM[record_months], np.full(n_negative, 90))),
+                out=static_features[row:row + n_records + n_negative]
+            )
+            
+            # Bloom occurred in the July-October window of Medium+ severity records
+            severe = np.array([b.get('severity', 'Low') in _BLOOM_SEVERITIES for b in historical_blooms])
+            static_targets[row:row + n_records] = _BLOOM_SEASON[record_months] & np.repeat(severe, len(_MONTHS))
+            
+            row += n_records + n_negative
+        
+        if n_static:
+            feature_chunks.append(static_features)
+            target_chunks.append(static_targets)
+            n_samples += n_static
         
         # Ensure we have enough training data by generating synthetic examples if needed
-        if len(features_list) < 20:
-            print(f"ℹ️ Generating synthetic training examples to reach minimum threshold (current: {len(features_list)})")
+        if n_samples < 20:
+            print(f"ℹ️ Generating synthetic training examples to reach minimum threshold (current: {n_samples})")
             
             # Use waterbody averages to create synthetic samples
-            avg_area = np.mean([info.get('area_km2', 10) for info in waterbodies_data.values()])
-            avg_depth = np.mean([info.get('depth_m', 5) for info in waterbodies_data.values()])
-            avg_pollution = np.mean([len(info.get('pollution_sources', [])) for info in waterbodies_data.values()])
-            
-            while len(features_list) < 20:
-                # Generate varied synthetic samples
-                month = np.random.randint(1, 13)
-                season_factor = 1.3 if month in [8, 9, 10] else 0.7
-                temperature_factor = 1.2 if month in [6, 7, 8] else 0.8
-                bloom_frequency = np.random.uniform(0.1, 0.5)
-                days_since = np.random.randint(30, 365)
-                water_grade = np.random.randint(3, 8)
-                
-                features = [
-                    avg_area * np.random.uniform(0.5, 1.5),
-                    avg_depth * np.random.uniform(0.5, 1.5),
-                    max(1, int(avg_pollution * np.random.uniform(0.5, 1.5))),
-                    month,
-                    season_factor,
-                    temperature_factor,
-                    bloom_frequency,
-                    days_since,
-                    water_grade
-                ]
-                
-                # Bloom probability based on conditions
-                bloom_occurred = 1 if (month in [7, 8, 9, 10] and temperature_factor > 1.0 and season_factor > 1.0) else 0
-                
-                features_list.append(features)
-                bloom_targets.append(bloom_occurred)
+            # (single pass over the waterbodies)
+            characteristics = np.fromiter(
+                ((info.get('area_km2', 10), info.get('depth_m', 5), len(info.get('pollution_sources', [])))
+                 for info in waterbodies_data.values()),
+                dtype=[('area', 'f8'), ('depth', 'f8'), ('pollution', 'i8')],
+                count=len(waterbodies_data)
+            )
+            avg_area = characteristics['area'].mean()
+            avg_depth = characteristics['depth'].mean()
+            avg_pollution = characteristics['pollution'].mean()
+            
+            # Draw every synthetic sample's random values in one batch per column
+            rng = np.random.default_rng(42)
+            n_needed = 20 - n_samples
+            months = rng.integers(1, 13, n_needed)
+            season_factor = _SEASON_FACTOR[months]
+            temperature_factor = _TEMPERATURE_FACTOR[months]
             
-            print(f"✅ Generated {len(features_list)} total training samples (including synthetic)")
+            features = self._assemble_features(
+                avg_area * rng.uniform(0.5, 1.5, n_needed),
+                avg_depth * rng.uniform(0.5, 1.5, n_needed),
+                np.maximum(1, (avg_pollution * rng.uniform(0.5, 1.5, n_needed)).astype(np.int64)),
+                rng.uniform(0.1, 0.5, n_needed),
+                rng.integers(3, 8, n_needed),
+                months=months,
+                season_factor=season_factor,
+                temperature_factor=temperature_factor,
+                days_since=rng.integers(30, 365, n_needed),
+                dtype=_FEATURE_DTYPE
+            )
+            
+            # Bloom probability based on conditions
+            targets = (_BLOOM_SEASON[months] & (temperature_factor > 1.0) & (season_factor > 1.0)).astype(_TARGET_DTYPE)
+            
+            feature_chunks.append(features)
+            target_chunks.append(targets)
+            n_samples += n_needed
+            
+            print(f"✅ Generated {n_samples} total training samples (including synthetic)")
+        
+        if len(feature_chunks) == 1:
+            return feature_chunks[0], target_chunks[0]
+        return np.concatenate(feature_chunks), np.concatenate(target_chunks)
+    
+    def _assemble_features(self, area_km2: float, depth_m: float, pollution_sources: int,
+                           bloom_frequency: float, water_grade: int, months: np.ndarray,
+                           season_factor: np.ndarray, temperature_factor: np.ndarray,
+                           days_since: np.ndarray, out: Optional[np.ndarray] = None,
+                           dtype: type = np.float64) -> np.ndarray:
+        """
+        Assemble an (n, 9) feature block in feature_names order
         
-        return np.array(features_list), np.array(bloom_targets)
+        Per-waterbody constants are broadcast down their columns; the month-dependent
+        columns are taken from the given per-row arrays. Fills `out` in place when given,
+        otherwise allocates a `dtype` block (float64 for forecast rows; training
+        passes _FEATURE_DTYPE).
+        """
+        features = np.empty((len(months), len(self.feature_names)), dtype=dtype) if out is None else out
+        features[:, 0] = area_km2
+        features[:, 1] = depth_m
+        features[:, 2] = pollution_sources
+        features[:, 3] = months
+        features[:, 4] = season_factor
+        features[:, 5] = temperature_factor
+        features[:, 6] = bloom_frequency
+        features[:, 7] = days_since
+        features[:, 8] = water_grade
+        return features
     
-    def train_models(self, waterbodies_data: Dict[str, Any], model_type: str = 'random_forest', use_satellite_data: bool = True) -> Dict[str, Any]:
+    def train_models(self, waterbodies_data: Dict[str, Any], model_type: Optional[str] = None,
+                     use_satellite_data: bool = True, use_cache: bool = True) -> Dict[str, Any]:
         """
         Train ML classification model on historical patterns
         
         Args:
             waterbodies_data: Dictionary containing waterbody information
-            model_type: 'random_forest' or 'decision_tree'
+            model_type: 'hist_gbdt', 'random_forest', 'decision_tree' or 'logistic';
+                None picks 'logistic' for small training sets and 'hist_gbdt' otherwise
             use_satellite_data: If True, use real satellite-detected blooms for training
+            use_cache: If True, reuse a model previously trained on identical training samples
             
         Returns:
             Dictionary containing training results and metrics
@@ -301,24 +466,77 @@ class AlgaeBloomPredictor:
             }
             return self.training_info
         
+        # Keyed on the prepared samples, so a static fallback or a new satellite
+        # pull never reuses a model trained on different data
+        cache_path = None
+        if use_cache:
+            cache_path = self._model_cache_path(X, y, model_type or 'auto')
+            if self._load_cached_model(cache_path):
+                return self.training_info
+        
+        # Tree ensembles' fixed fitting cost buys nothing on a few dozen samples
+        if model_type is None:
+            model_type = 'logistic' if len(X) < _SMALL_TRAINING_SET else 'hist_gbdt'
+        
         # Split data with stratification
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Scale features (tree ensembles split on raw values and are scale-invariant;
+        # keeping the forest on raw features also lets it grow across calls)
+        if model_type in ('hist_gbdt', 'random_forest'):
+            self.scaler = None
+            X_train_scaled, X_test_scaled = X_train, X_test
+        else:
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
         
-        # Initialize model
-        if model_type == 'random_forest':
-            self.classification_model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                min_samples_split=5,
+        # Initialize model (previous_rows: rows the kept trees of a warm-started forest saw)
+        previous_rows = None
+        if model_type == 'hist_gbdt':
+            self.classification_model = HistGradientBoostingClassifier(
+                max_depth=6,
+                max_iter=100,
+                learning_rate=0.1,
+                min_samples_leaf=5,  # Default of 20 cannot split the smallest training sets
+                early_stopping='auto',
                 random_state=42,
                 class_weight='balanced'
             )
+        elif model_type == 'logistic':
+            self.classification_model = LogisticRegression(
+                solver='liblinear',
+                class_weight='balanced'
+            )
+        elif model_type == 'random_forest':
+            training_rows = {row.tobytes() for row in X}
+            bloom_share = float(np.mean(y_train))
+            if self._can_warm_start_forest(training_rows, bloom_share):
+                previous_rows = self._forest_training_rows
+                # New data only extends the previous set with about the same class
+                # balance: keep the fitted trees (weighted for the old labels) and grow
+                # a few more on the full data. The new trees get explicit balanced
+                # weights for the new labels, since the 'balanced' preset is not
+                # meant for warm starts.
+                classes = np.unique(y_train)
+                self.classification_model.class_weight = dict(
+                    zip(classes, compute_class_weight('balanced', classes=classes, y=y_train))
+                )
+                self.classification_model.n_estimators += 20
+                self.classification_model.warm_start = True
+            else:
+                self.classification_model = RandomForestClassifier(
+                    n_estimators=100,
+                    max_depth=10,
+                    min_samples_split=5,
+                    random_state=42,
+                    class_weight='balanced',
+                    n_jobs=1  # Joblib worker start-up outweighs the work on small predict batches
+                )
+            self._forest_training_rows = training_rows
+            self._forest_bloom_share = bloom_share
         else:  # decision_tree
             self.classification_model = DecisionTreeClassifier(
                 max_depth=8,
@@ -327,25 +545,208 @@ class AlgaeBloomPredictor:
                 class_weight='balanced'
             )
         
+        if model_type != 'random_forest':
+            self._forest_training_rows = None
+        
         # Train classification model
         self.classification_model.fit(X_train_scaled, y_train)
-        y_pred = self.classification_model.predict(X_test_scaled)
-        accuracy = accuracy_score(y_test, y_pred)
+        if model_type == 'random_forest':
+            self.classification_model.warm_start = False
+        
+        if previous_rows is not None:
+            # The kept trees were fitted on an earlier split, so rows from earlier
+            # calls may sit in this test set; score only rows no tree has seen
+            unseen = np.fromiter((row.tobytes() not in previous_rows for row in X_test),
+                                 dtype=bool, count=len(X_test))
+            X_test_scaled, y_test = X_test_scaled[unseen], y_test[unseen]
+        
+        if len(y_test):
+            y_pred = self.classification_model.predict(X_test_scaled)
+            accuracy = accuracy_score(y_test, y_pred)
+        else:
+            accuracy = None  # No held-out rows left to score
         
         self.is_trained = True
+        feature_importance = self._get_feature_importance()
+        
+        # Inference then runs on raw features with no scaling step
+        self._fold_scaler_into_model()
+        self._probability_cache.clear()
+        self._build_inference_backend()
         
         self.training_info = {
             'success': True,
             'model_type': model_type,
             'samples_trained': len(X_train),
-            'samples_tested': len(X_test),
+            'samples_tested': len(y_test),
             'classification_accuracy': accuracy,
             'bloom_percentage': np.mean(y) * 100,
-            'feature_importance': self._get_feature_importance()
+            'feature_importance': feature_importance
         }
         
+        # A warm-started forest depends on earlier calls, not only on these inputs,
+        # so it must not be stored under their cache key
+        if cache_path is not None and previous_rows is None:
+            self._save_cached_model(cache_path)
+        
         return self.training_info
     
+    def _can_warm_start_forest(self, training_rows: set, bloom_share: float) -> bool:
+        """
+        True if the fitted forest's training rows are a strict subset of the new
+        ones and the bloom share of the labels has not shifted
+        """
+        return (
+            isinstance(self.classification_model, RandomForestClassifier)
+            and self._forest_training_rows is not None
+            and self._forest_training_rows < training_rows
+            and abs(bloom_share - self._forest_bloom_share) <= _WARM_START_BALANCE_TOLERANCE
+        )
+    
+    def _fold_scaler_into_model(self):
+        """
+        Fold the fitted StandardScaler into the model parameters and drop it
+        
+        A tree split x_scaled <= t is the same test as x <= t * scale + mean
+        (scale > 0), and a linear model absorbs the affine map into its
+        coefficients and intercept, so predictions on raw features are unchanged.
+        """
+        if self.scaler is None:
+            return
+        
+        mean = self.scaler.mean_
+        scale = self.scaler.scale_
+        model = self.classification_model
+        
+        if hasattr(model, 'estimators_'):
+            trees = [estimator.tree_ for estimator in model.estimators_]
+        elif hasattr(model, 'tree_'):
+            trees = [model.tree_]
+        elif hasattr(model, 'coef_'):
+            model.intercept_ = model.intercept_ - model.coef_ @ (mean / scale)
+            model.coef_ = model.coef_ / scale
+            trees = []
+        else:
+            # Inference has no separate scaling step, so every scaled model type must fold
+            raise TypeError(f"Cannot fold feature scaling into {type(model).__name__}")
+        
+        # Leaves have feature == -2; only split nodes carry a threshold
+        for tree in trees:
+            is_split = tree.feature >= 0
+            split_features = tree.feature[is_split]
+            tree.threshold[is_split] = tree.threshold[is_split] * scale[split_features] + mean[split_features]
+        
+        self.scaler = None
+    
+    def _model_cache_path(self, X: np.ndarray, y: np.ndarray, model_type: str) -> str:
+        """Cache file for a model trained on the given samples with this code and scikit-learn version"""
+        key = hashlib.blake2b(digest_size=8)
+        key.update(f"{_MODEL_CACHE_VERSION}|{sklearn.__version__}|{model_type}|{X.shape}|".encode('utf-8'))
+        key.update(np.ascontiguousarray(X).tobytes())
+        key.update(np.ascontiguousarray(y).tobytes())
+        return os.path.join(_model_cache_dir(), f"algae_{model_type}_{key.hexdigest()}.joblib")
+    
+    def _load_cached_model(self, cache_path: str) -> bool:
+        """Restore scaler, model and training info from cache; returns True on a hit"""
+        if not os.path.exists(cache_path):
+            return False
+        
+        # joblib files are pickles: only load ones nobody else could have written
+        if not _is_trusted_cache_file(cache_path):
+            print(f"⚠️ Ignoring model cache {cache_path}: not owned by this user or writable by others")
+            return False
+        
+        try:
+            self.scaler, self.classification_model, self.training_info = joblib.load(cache_path)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable model cache {cache_path}: {str(e)}")
+            return False
+        
+        # The cached model's training rows are unknown, so it is never warm-started
+        self._forest_training_rows = None
+        self.is_trained = True
+        self._probability_cache.clear()
+        self._build_inference_backend()
+        return True
+    
+    def _save_cached_model(self, cache_path: str):
+        """Persist scaler, model and training info for later sessions"""
+        try:
+            os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+            joblib.dump((self.scaler, self.classification_model, self.training_info), cache_path, compress=3)
+            os.chmod(cache_path, 0o600)
+        except Exception as e:
+            print(f"⚠️ Could not write model cache {cache_path}: {str(e)}")
+    
+    def _build_inference_backend(self):
+        """
+        Compile the fitted random forest for fast inference when possible
+        
+        Prefers an ONNX Runtime session and falls back to a Treelite-compiled
+        shared library; other models keep scikit-learn inference. Any feature
+        scaling has already been folded into the model (_fold_scaler_into_model).
+        """
+        self._onnx_session = None
+        self._tl_predictor = None
+        if not isinstance(self.classification_model, RandomForestClassifier):
+            return
+        
+        if ONNX_AVAILABLE:
+            self._build_onnx_session()
+        if self._onnx_session is None and TREELITE_AVAILABLE:
+            self._build_treelite_predictor()
+    
+    def _build_treelite_predictor(self):
+        """Compile the forest with Treelite into the model cache and load it"""
+        try:
+            # Same versioning as the model cache, plus the compiler toolchain versions
+            model_hash = hashlib.blake2b(digest_size=8)
+            model_hash.update(f"{_MODEL_CACHE_VERSION}|{treelite.__version__}|{tl2cgen.__version__}|".encode('utf-8'))
+            model_hash.update(pickle.dumps(self.classification_model))
+            libpath = os.path.join(_model_cache_dir(), f"algae_rf_{model_hash.hexdigest()}.so")
+            
+            # Compilation takes seconds; reuse the library built for an identical forest
+            if not os.path.exists(libpath):
+                os.makedirs(os.path.dirname(libpath), mode=0o700, exist_ok=True)
+                tl_model = treelite.sklearn.import_model(self.classification_model)
+                tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=libpath, params={'parallel_comp': 4})
+                os.chmod(libpath, 0o700)
+            elif not _is_trusted_cache_file(libpath):
+                # Loading runs the library's native code
+                print(f"⚠️ Ignoring compiled forest {libpath}: not owned by this user or writable by others")
+                return
+            
+            self._tl_predictor = tl2cgen.Predictor(libpath)
+        except Exception as e:
+            print(f"⚠️ Treelite compilation failed, using scikit-learn inference: {str(e)}")
+    
+    def _build_onnx_session(self):
+        """Convert the fitted random forest to an ONNX Runtime session"""
+        try:
+            onnx_model = convert_sklearn(
+                self.classification_model,
+                initial_types=[('input', FloatTensorType([None, len(self.feature_names)]))],
+                options={id(self.classification_model): {'zipmap': False}}
+            )
+            self._onnx_session = ort.InferenceSession(
+                onnx_model.SerializeToString(), providers=['CPUExecutionProvider']
+            )
+        except Exception as e:
+            print(f"⚠️ ONNX export failed, using scikit-learn inference: {str(e)}")
+    
+    def _bloom_probabilities(self, features: np.ndarray) -> np.ndarray:
+        """
+        Bloom probability for every row of an (n, 9) feature matrix
+        
+        Runs a single inference call on the raw features, through a compiled
+        backend (ONNX Runtime or Treelite) when one exists.
+        """
+        if self._onnx_session is not None:
+            return self._onnx_session.run(None, {'input': features.astype(np.float32)})[1][:, 1]
+        if self._tl_predictor is not None:
+            return self._tl_predictor.predict(tl2cgen.DMatrix(features.astype(np.float32)))[:, 0, 1]
+        return self.classification_model.predict_proba(features)[:, 1]
+    
     def predict_bloom_risk(self, waterbody_info: Dict[str, Any], 
                           current_conditions: Dict[str, Any], 
                           days_ahead: int = 14) -> Dict[str, Any]:
@@ -368,80 +769,139 @@ class AlgaeBloomPredictor:
         
         # Calculate future date
         future_date = datetime.now() + timedelta(days=days_ahead)
-        future_month = future_date.month
         
-        # Prepare features for ML classification
-        grade_map = {'A': 1, 'B+': 2, 'B': 3, 'C+': 4, 'C': 5, 'C-': 6, 'D+': 7, 'D': 8, 'E': 9}
-        
-        area_km2 = waterbody_info.get('area_km2', 10)
-        depth_m = waterbody_info.get('depth_m', 5)
-        pollution_sources = len(waterbody_info.get('pollution_sources', []))
-        water_grade = grade_map.get(waterbody_info.get('water_quality_grade', 'C'), 5)
-        
-        season_factor = 1.3 if future_month in [8, 9, 10] else 0.7
-        temperature_factor = 1.2 if future_month in [6, 7, 8] else 0.8
-        
-        historical_blooms = waterbody_info.get('historical_blooms', [])
-        bloom_frequency = len(historical_blooms) / max(1, 3)  # 3 years of data
-        days_since = 180  # Estimated
-        
-        features = np.array([[
-            area_km2,
-            depth_m,
-            pollution_sources,
-            future_month,
-            season_factor,
-            temperature_factor,
-            bloom_frequency,
-            days_since,
-            water_grade
-        ]])
-        
-        # Use ML model if trained
-        if SKLEARN_AVAILABLE and self.is_trained and self.classification_model is not None:
-            features_scaled = self.scaler.transform(features)
-            bloom_probability = self.classification_model.predict_proba(features_scaled)[0][1]
-            will_bloom = self.classification_model.predict(features_scaled)[0]
-        else:
-            # Fallback rule-based prediction
-            risk_score = (
-                (pollution_sources / 5) * 0.2 +
-                (water_grade / 9) * 0.2 +
-                season_factor * 0.2 +
-                temperature_factor * 0.2 +
-                bloom_frequency * 0.2
-            )
-            bloom_probability = min(1.0, risk_score)
-            will_bloom = 1 if bloom_probability > 0.5 else 0
+        # ML classification when trained, rule-based score otherwise
+        features = self._forecast_features(waterbody_info, np.array([future_date.month]))
+        bloom_probability = self._cached_probability(features[0])
+        will_bloom = 1 if bloom_probability > 0.5 else 0  # Same decision as predict() for 0/1 classes
         
         # Forecast coverage using growth model
         predicted_coverage = current_coverage + (growth_rate_per_day * days_ahead)
         predicted_coverage = max(0, min(100, predicted_coverage))
         
-        # Determine risk category
-        if predicted_coverage > 50 or bloom_probability > 0.8:
-            risk_category = "Very High"
-        elif predicted_coverage > 30 or bloom_probability > 0.6:
-            risk_category = "High"
-        elif predicted_coverage > 15 or bloom_probability > 0.4:
-            risk_category = "Medium"
-        else:
-            risk_category = "Low"
+        predicted_coverage = float(predicted_coverage)
         
+        risk_category = self._risk_category(predicted_coverage, bloom_probability)
+        # bloom_probability is already a Python float (see _cached_probability)
         confidence = bloom_probability if will_bloom else (1 - bloom_probability)
         
         return {
             'will_bloom': bool(will_bloom),
-            'bloom_probability': float(bloom_probability),
-            'predicted_coverage': float(predicted_coverage),
-            'future_coverage': float(predicted_coverage),
+            'bloom_probability': bloom_probability,
+            'predicted_coverage': predicted_coverage,
+            'future_coverage': predicted_coverage,
             'risk_category': risk_category,
-            'confidence': float(confidence),
+            'confidence': confidence,
             'prediction_horizon_days': days_ahead,
             'model_used': 'ML-Hybrid' if (SKLEARN_AVAILABLE and self.is_trained) else 'Rule-based',
             'growth_rate_per_day': growth_rate_per_day
         }
     
+    def predict_bloom_risk_batch(self, features: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Classify many feature rows with a single model call
+        
+        Prefer this over repeated predict_bloom_risk calls when scoring many
+        scenarios; per-call model overhead dominates single-row inference.
+        
+        Args:
+            features: (N, 9) array with columns in feature_names order
+            
+        Returns:
+            List of N dictionaries with will_bloom, bloom_probability and confidence
+        """
+        
+        probabilities = self._forecast_probabilities(np.asarray(features, dtype=float).reshape(-1, len(self.feature_names)))
+        
+        results = []
+        for bloom_probability in probabilities.tolist():
+            will_bloom = bloom_probability > 0.5
+            results.append({
+                'will_bloom': will_bloom,
+                'bloom_probability': bloom_probability,
+                'confidence': bloom_probability if will_bloom else (1 - bloom_probability)
+            })
+        
+        return results
+    
+    def _cached_probability(self, feature_row: np.ndarray) -> float:
+        """Bloom probability for one feature row, memoized until the model changes"""
+        key = tuple(feature_row.tolist())
+        bloom_probability = self._probability_cache.get(key)
+        if bloom_probability is None:
+            if len(self._probability_cache) >= 4096:
+                self._probability_cache.clear()
+            bloom_probability = float(self._forecast_probabilities(feature_row[np.newaxis, :])[0])
+            self._probability_cache[key] = bloom_probability
+        return bloom_probability
+    
+    def _forecast_features(self, waterbody_info: Dict[str, Any], months: np.ndarray) -> np.ndarray:
+        """
+        Build one forecast feature row per target month for a waterbody
+        
+        Args:
+            waterbody_info: Waterbody characteristics
+            months: Array of target months (1-12)
+            
+        Returns:
+            (len(months), 9) feature matrix
+        """
+        grade_map = {'A': 1, 'B+': 2, 'B': 3, 'C+': 4, 'C': 5, 'C-': 6, 'D+': 7, 'D': 8, 'E': 9}
+        
+        historical_blooms = waterbody_info.get('historical_blooms', [])
+        
+        return self._assemble_features(
+            waterbody_info.get('area_km2', 10),
+            waterbody_info.get('depth_m', 5),
+            len(waterbody_info.get('pollution_sources', [])),
+            len(historical_blooms) / max(1, 3),  # 3 years of data
+            grade_map.get(waterbody_info.get('water_quality_grade', 'C'), 5),
+            months=months,
+            season_factor=_SEASON_FACTOR[months],
+            temperature_factor=_TEMPERATURE_FACTOR[months],
+            days_since=180  # Estimated
+        )
+    
+    def _forecast_probabilities(self, features: np.ndarray) -> np.ndarray:
+        """Bloom probability per feature row: ML model if trained, else rule-based score"""
+        if SKLEARN_AVAILABLE and self.is_trained and self.classification_model is not None:
+            return self._bloom_probabilities(features)
+        
+        # Fallback rule-based prediction
+        return _rule_score(
+            features[:, 2],  # pollution sources
+            features[:, 8],  # water quality grade
+            features[:, 4],  # season factor
+            features[:, 5],  # temperature factor
+            features[:, 6]   # historical bloom frequency
+        )
+    
+    @staticmethod
+    def _risk_category(predicted_coverage: float, bloom_probability: float) -> str:
+        """Map forecast coverage and bloom probability to a risk category"""
+        if predicted_coverage > 50 or bloom_probability > 0.8:
+            return "Very High"
+        elif predicted_coverage > 30 or bloom_probability > 0.6:
+            return "High"
+        elif predicted_coverage > 15 or bloom_probability > 0.4:
+            return "Medium"
+        else:
+            return "Low"
+    
+    @staticmethod
+    def _risk_categories(predicted_coverages: np.ndarray, bloom_probabilities: np.ndarray) -> List[str]:
+        """Vectorized _risk_category over aligned coverage and probability arrays"""
+        categories = np.select(
+            [
+                (predicted_coverages > 50) | (bloom_probabilities > 0.8),
+                (predicted_coverages > 30) | (bloom_probabilities > 0.6),
+                (predicted_coverages > 15) | (bloom_probabilities > 0.4)
+            ],
+            ["Very High", "High", "Medium"],
+            default="Low"
+        )
+        return categories.tolist()
+    
     def calculate_ml_growth_rate(self, lat: float, lon: float, years_back: int = 3) -> Dict[str, Any]:
         """
         Calculate algae growth rate using machine learning on real satellite temporal data
@@ -508,29 +968,21 @@ class AlgaeBloomPredictor:
                     'data_points': len(historical_blooms) if historical_blooms else 0
                 }
             
-            # Extract temporal features
-            dates = []
-            chl_a_values = []
-            fai_values = []
-            
-            for bloom in historical_blooms:
-                year = bloom.get('year', 2024)
-                month = bloom.get('month', 1)
-                chl_a = bloom.get('chlorophyll_a', 0)
-                fai = bloom.get('fai', 0)
-                
-                # Create date representation (months since earliest date)
-                dates.append(year * 12 + month)
-                chl_a_values.append(chl_a)
-                fai_values.append(fai)
+            # Extract temporal features in one pass
+            records = np.fromiter(
+                ((b.get('year', 2024), b.get('month', 1), b.get('chlorophyll_a', 0), b.get('fai', 0))
+                 for b in historical_blooms),
+                dtype=[('year', 'i8'), ('month', 'i8'), ('chlorophyll_a', 'f8'), ('fai', 'f8')],
+                count=len(historical_blooms)
+            )
             
-            # Normalize dates to start from 0
-            min_date = min(dates)
-            dates_normalized = [(d - min_date) for d in dates]
+            # Create date representation (months since earliest date)
+            dates = records['year'] * 12 + records['month']
+            dates_normalized = dates - dates.min()
             
-            # Convert to numpy arrays
-            X = np.array(dates_normalized).reshape(-1, 1)  # Time (months)
-            y_chl = np.array(chl_a_values)  # Chlorophyll-a
+            X = dates_normalized.reshape(-1, 1)  # Time (months)
+            y_chl = records['chlorophyll_a']  # Chlorophyll-a
+            mean_chl_a = y_chl.mean()
             
             # Method 1: Linear regression on chlorophyll-a trend
             lr_model = LinearRegression()
@@ -539,16 +991,17 @@ class AlgaeBloomPredictor:
             # Get slope (change per month)
             slope_per_month = lr_model.coef_[0]
             
-            # Calculate R-squared for confidence
+            # Calculate R-squared for confidence (dot products avoid squared temporaries)
             y_pred = lr_model.predict(X)
-            ss_res = np.sum((y_chl - y_pred) ** 2)
-            ss_tot = np.sum((y_chl - np.mean(y_chl)) ** 2)
+            residuals = y_chl - y_pred
+            centered = y_chl - mean_chl_a
+            ss_res = residuals @ residuals
+            ss_tot = centered @ centered
             r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
             
             # Convert to weekly rate and percentage
             # slope_per_month is in μg/L per month
             # Convert to % change per week based on current chlorophyll level
-            mean_chl_a = np.mean(chl_a_values)
             
             if mean_chl_a > 0:
                 # Percentage change per week = (slope_per_month / mean_chl_a) * (1 week / 4.33 weeks per month) * 100
@@ -579,9 +1032,9 @@ class AlgaeBloomPredictor:
                 'mean_chlorophyll': float(mean_chl_a),
                 'slope_per_month': float(slope_per_month),
                 'temporal_data': {
-                    'months': dates_normalized,
-                    'chlorophyll_a': chl_a_values,
-                    'fai': fai_values,
+                    'months': dates_normalized.tolist(),
+                    'chlorophyll_a': y_chl.tolist(),
+                    'fai': records['fai'].tolist(),
                     'trend_line': y_pred.tolist()
                 }
             }
@@ -610,28 +1063,14 @@ class AlgaeBloomPredictor:
             Estimated growth rate as % per day
         """
         
-        chlorophyll_a = current_conditions.get('chlorophyll_a', 10)
-        temperature_factor = current_conditions.get('temperature_factor', 1.0)
-        nutrient_factor = current_conditions.get('nutrient_factor', 1.0)
-        seasonal_factor = current_conditions.get('seasonal_factor', 1.0)
-        
-        # Base growth rate depends on current chlorophyll levels
-        if chlorophyll_a > 30:
-            base_rate = 0.8  # High growth
-        elif chlorophyll_a > 15:
-            base_rate = 0.5  # Moderate growth
-        elif chlorophyll_a > 5:
-            base_rate = 0.2  # Slow growth
-        else:
-            base_rate = 0.05  # Minimal growth
-        
-        # Adjust for environmental factors
-        adjusted_rate = base_rate * temperature_factor * nutrient_factor * seasonal_factor
-        
-        # Add some stochasticity
-        noise = np.random.normal(0, 0.05)
-        
-        return max(-0.5, min(2.0, adjusted_rate + noise))
+        # Stochasticity is sampled here so the arithmetic stays JIT-friendly
+        return _growth_rate_core(
+            float(current_conditions.get('chlorophyll_a', 10)),
+            float(current_conditions.get('temperature_factor', 1.0)),
+            float(current_conditions.get('nutrient_factor', 1.0)),
+            float(current_conditions.get('seasonal_factor', 1.0)),
+            np.random.normal(0, 0.05)
+        )
     
     def predict_temporal_progression(self, waterbody_info: Dict[str, Any],
                                     current_conditions: Dict[str, Any], 
@@ -648,30 +1087,40 @@ class AlgaeBloomPredictor:
             List of daily predictions
         """
         
-        progression = []
-        running_coverage = current_conditions.get('current_coverage', 20)
+        now = datetime.now()
+        dates = [now + timedelta(days=day) for day in range(days)]
         
-        for day in range(days):
-            # Update growth rate for each day
-            updated_conditions = current_conditions.copy()
-            updated_conditions['current_coverage'] = running_coverage
-            updated_conditions['chlorophyll_a'] = running_coverage * 0.5  # Rough estimate
-            
-            # Predict for this day
-            prediction = self.predict_bloom_risk(waterbody_info, updated_conditions, days_ahead=day)
-            
-            # Update running coverage
-            running_coverage = prediction['future_coverage']
-            
-            progression.append({
-                'day': day,
-                'date': (datetime.now() + timedelta(days=day)).strftime('%Y-%m-%d'),
-                'predicted_coverage': prediction['future_coverage'],
-                'risk_category': prediction['risk_category'],
-                'bloom_probability': prediction['bloom_probability']
-            })
+        # Bloom probability only depends on the target month, so all days are
+        # scored in one batch
+        months = np.fromiter((date.month for date in dates), dtype=np.int64, count=days)
+        probabilities = self._forecast_probabilities(self._forecast_features(waterbody_info, months))
+        
+        # Coverage recurrence: each day's growth rate depends on the running coverage
+        coverages = _temporal_progression_core(
+            float(current_conditions.get('current_coverage', 20)),
+            float(current_conditions.get('temperature_factor', 1.0)),
+            float(current_conditions.get('nutrient_factor', 1.0)),
+            float(current_conditions.get('seasonal_factor', 1.0)),
+            np.random.normal(0, 0.05, days)
+        )
+        
+        # One bulk conversion to Python floats instead of a cast per value
+        coverage_values = coverages.tolist()
+        probability_values = probabilities.tolist()
+        risk_categories = self._risk_categories(coverages, probabilities)
         
-        return progression
+        return [
+            {
+                'day': day,
+                'date': date.strftime('%Y-%m-%d'),
+                'predicted_coverage': coverage,
+                'risk_category': risk_category,
+                'bloom_probability': probability
+            }
+            for day, (date, coverage, risk_category, probability) in enumerate(
+                zip(dates, coverage_values, risk_categories, probability_values)
+            )
+        ]
     
     def _get_feature_importance(self) -> Dict[str, float]:
         """Get feature importance from trained model"""
@@ -680,7 +1129,12 @@ class AlgaeBloomPredictor:
             return {}
         
         try:
-            importances = self.classification_model.feature_importances_
+            if hasattr(self.classification_model, 'coef_'):
+                # Linear model: normalized coefficient magnitudes on the scaled features
+                weights = np.abs(self.classification_model.coef_[0])
+                importances = weights / weights.sum() if weights.sum() > 0 else weights
+            else:
+                importances = self.classification_model.feature_importances_
             
             importance_dict = {}
             for i, feature_name in enumerate(self.feature_names):
@@ -701,41 +1155,7 @@ class AlgaeBloomPredictor:
             List of recommended actions
         """
         
-        recommendations = []
-        
-        risk_category = prediction['risk_category']
-        future_coverage = prediction['future_coverage']
-        days_ahead = prediction['prediction_horizon_days']
-        bloom_prob = prediction['bloom_probability']
-        
-        if risk_category == "Very High":
-            recommendations.extend([
-                f"URGENT: Very high bloom risk (prob: {bloom_prob*100:.0f}%) within {days_ahead} days",
-                "Implement emergency response protocols immediately",
-                "Increase monitoring to daily frequency",
-                "Prepare algaecide treatment equipment",
-                "Issue public health advisory"
-            ])
-        elif risk_category == "High":
-            recommendations.extend([
-                f"HIGH ALERT: Elevated bloom risk (prob: {bloom_prob*100:.0f}%) for next {days_ahead} days",
-                "Increase monitoring frequency (2-3x per week)",
-                "Reduce nutrient inputs immediately",
-                "Prepare treatment measures",
-                "Consider preemptive action"
-            ])
-        elif risk_category == "Medium":
-            recommendations.extend([
-                f"MODERATE: Watch for bloom development (prob: {bloom_prob*100:.0f}%)",
-                "Maintain regular monitoring schedule",
-                "Review nutrient management practices",
-                "Ensure treatment readiness"
-            ])
-        else:
-            recommendations.extend([
-                f"LOW: Minimal bloom risk currently (prob: {bloom_prob*100:.0f}%)",
-                "Continue standard monitoring program",
-                "Maintain preventive measures"
-            ])
+        headline, actions = _RISK_TEMPLATES.get(prediction['risk_category'], _RISK_TEMPLATES["Low"])
+        headline = headline.format(p=prediction['bloom_probability'] * 100, d=prediction['prediction_horizon_days'])
         
-        return recommendations
+        return [headline, *actions]
@@ -3,40 +3,107 @@ Report Generation Module
 Handles PDF and CSV report generation for algae analysis results
 """
 
+import bisect
+import csv
 import io
-import pandas as pd
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
-import base64
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.backends.backend_pdf import PdfPages
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, BinaryIO, Optional, Union
 import numpy as np
 
-# Try to import reportlab for better PDF generation, fallback to matplotlib
+# Try to import reportlab for better PDF generation, fallback to matplotlib.
+# Only the package itself is probed here; the ReportLab and matplotlib modules
+# that build the documents are imported where they are used, so CSV-only and
+# summary-only callers do not pay for them.
 try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.graphics.shapes import Drawing
-    from reportlab.graphics.charts.linecharts import HorizontalLineChart
-    from reportlab.graphics.charts.piecharts import Pie
+    import reportlab
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+# Interpretation bands per index type: ascending thresholds and one label per band.
+# A value falls in band i when it exceeds exactly i thresholds. Checked in order
+# against the index name.
+_INDEX_RULES = {
+    'NDVI': ((0.1, 0.3, 0.6),
+             ("Water/non-vegetated", "Sparse vegetation", "Moderate vegetation", "Dense vegetation/algae")),
+    'NDWI': ((0, 0.3),
+             ("Dry/vegetated areas", "Wet areas", "Open water")),
+    'Chlorophyll': ((8, 15, 30),
+                    ("Low levels", "Moderate levels", "High - bloom present", "Very high - severe bloom")),
+    'Turbidity': ((10, 20, 40),
+                  ("Clear", "Slightly turbid", "Turbid", "Very turbid")),
+    'FAI': ((0, 0.005, 0.015),
+            ("No floating algae", "Light algae presence", "Moderate floating algae", "Dense floating algae"))
+}
+
+# Write buffer for persisting generated reports (one write call for typical reports)
+_SAVE_BUFFER_SIZE = 1 << 20
+
+# Generic mitigation actions listed in the PDF report
+_RECOMMENDED_ACTIONS = (
+    "Monitor water quality regularly",
+    "Reduce nutrient inputs to waterbody",
+    "Consider professional water testing",
+    "Implement appropriate treatment measures"
+)
+_RECOMMENDED_ACTIONS_HTML = "<b>Recommended Actions:</b><br/>" + "".join(
+    f"• {action}<br/>" for action in _RECOMMENDED_ACTIONS
+)
+
+# Immediate actions in the executive summary per risk level (any other level
+# uses the "Low" actions), pre-rendered into the summary's bullet layout
+_SUMMARY_ACTIONS = {
+    "High": (
+        "URGENT: Restrict water contact and usage",
+        "Implement emergency treatment measures",
+        "Notify relevant authorities and communities",
+        "Begin intensive monitoring program"
+    ),
+    "Medium": (
+        "Increase monitoring frequency",
+        "Implement preventive measures",
+        "Reduce nutrient inputs to waterbody",
+        "Consider water treatment options"
+    ),
+    "Low": (
+        "Continue regular monitoring",
+        "Maintain current management practices",
+        "Monitor for seasonal changes"
+    )
+}
+_SUMMARY_ACTION_BLOCKS = {
+    risk_level: "\n" + "".join(f"        • {action}\n" for action in actions) + "            "
+    for risk_level, actions in _SUMMARY_ACTIONS.items()
+}
+
+# Blank separator row between CSV export sections
+_EMPTY_CSV_ROW = ('', '', '', '', '')
+
+@lru_cache(maxsize=256)
+def _index_type_code(index_name: str) -> int:
+    """Position in _INDEX_RULES of the first index type named in index_name, or -1"""
+    for code, index_type in enumerate(_INDEX_RULES):
+        if index_type in index_name:
+            return code
+    return -1
+
 class ReportGenerator:
     """Generate comprehensive reports for algae bloom analysis"""
     
     def __init__(self):
         """Initialize report generator"""
         self.styles = self._create_styles()
+        self._summary_table_style, self._indices_table_style = self._create_table_styles()
     
     def _create_styles(self):
         """Create consistent styling for reports"""
         if REPORTLAB_AVAILABLE:
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib import colors
+            
             styles = getSampleStyleSheet()
             
             # Custom styles
@@ -67,27 +134,99 @@ class ReportGenerator:
         else:
             return {}
     
-    def generate_pdf_report(self, analysis_results: Dict[str, Any]) -> bytes:
+    def _create_table_styles(self):
+        """Create the (summary, indices) table styles once; they are reused by every report"""
+        if not REPORTLAB_AVAILABLE:
+            return None, None
+        
+        from reportlab.platypus import TableStyle
+        from reportlab.lib import colors
+        
+        summary_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        indices_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP')
+        ])
+        
+        return summary_table_style, indices_table_style
+    
+    def generate_pdf_report(self, analysis_results: Dict[str, Any],
+                            out_stream: Optional[BinaryIO] = None) -> Optional[bytes]:
         """
         Generate comprehensive PDF report
         
         Args:
             analysis_results: Complete analysis results dictionary
+            out_stream: Optional writable binary stream (file, HTTP response, ...);
+                when given, the PDF is written straight into it
             
         Returns:
-            PDF report as bytes
+            PDF report as bytes, or None when written to out_stream
         """
         
+        buffer = io.BytesIO() if out_stream is None else out_stream
+        
         if REPORTLAB_AVAILABLE:
-            return self._generate_reportlab_pdf(analysis_results)
+            self._generate_reportlab_pdf(analysis_results, buffer)
         else:
-            return self._generate_matplotlib_pdf(analysis_results)
+            self._generate_matplotlib_pdf(analysis_results, buffer)
+        
+        if out_stream is not None:
+            return None
+        return buffer.getvalue()
+    
+    def generate_pdf_reports(self, many_results: List[Dict[str, Any]],
+                             workers: Optional[int] = None) -> List[bytes]:
+        """
+        Generate PDF reports for several analyses on a thread pool
+        
+        Reports share only read-only state (styles, table styles), and the
+        matplotlib fallback uses standalone Figure objects, so they can be
+        built concurrently.
+        
+        Args:
+            many_results: List of analysis results dictionaries
+            workers: Maximum worker threads (defaults to the CPU count)
+            
+        Returns:
+            List of PDF reports as bytes, in input order
+        """
+        
+        if len(many_results) <= 1:
+            return [self.generate_pdf_report(results) for results in many_results]
+        
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return list(executor.map(self.generate_pdf_report, many_results))
     
-    def _generate_reportlab_pdf(self, results: Dict[str, Any]) -> bytes:
-        """Generate PDF using ReportLab"""
+    def _generate_reportlab_pdf(self, results: Dict[str, Any], out_stream: BinaryIO):
+        """Generate PDF using ReportLab, writing it to out_stream"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+        from reportlab.lib.units import inch
+        
+        now = datetime.now()
+        analysis_date = results.get('analysis_date', now.strftime('%Y-%m-%d'))
+        risk = results['risk_assessment']
+        impact = results['environmental_impact']
         
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
+        doc = SimpleDocTemplate(out_stream, pagesize=A4, topMargin=0.5*inch)
         
         # Build story (content)
         story = []
@@ -101,23 +240,14 @@ class ReportGenerator:
             ['Parameter', 'Value'],
             ['Waterbody', results.get('waterbody', 'Unknown')],
             ['Analysis Type', results.get('type', 'Unknown')],
-            ['Analysis Date', results.get('analysis_date', datetime.now().strftime('%Y-%m-%d'))],
-            ['Risk Level', results['risk_assessment']['risk_level']],
-            ['Risk Score', f"{results['risk_assessment']['risk_score']:.3f}"],
-            ['Algae Coverage', f"{results['risk_assessment']['algae_coverage_percent']:.1f}%"],
+            ['Analysis Date', analysis_date],
+            ['Risk Level', risk['risk_level']],
+            ['Risk Score', f"{risk['risk_score']:.3f}"],
+            ['Algae Coverage', f"{risk['algae_coverage_percent']:.1f}%"],
         ]
         
         summary_table = Table(summary_data, colWidths=[2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        summary_table.setStyle(self._summary_table_style)
         
         story.append(summary_table)
         story.append(Spacer(1, 20))
@@ -126,28 +256,11 @@ class ReportGenerator:
         story.append(Paragraph("Spectral Indices Analysis", self.styles['CustomHeading']))
         
         indices_data = [['Index', 'Value', 'Interpretation']]
-        for index, value in results['indices'].items():
-            if isinstance(value, dict):
-                val_str = f"{value.get('mean', 0):.3f}"
-                interp = value.get('interpretation', 'No interpretation')
-            else:
-                val_str = f"{value:.3f}"
-                interp = self._interpret_index_value(index, value)
-            
-            indices_data.append([index, val_str, interp])
+        for index, value, interp, _ in self._normalize_indices(results['indices'], 'No interpretation'):
+            indices_data.append([index, f"{value:.3f}", interp])
         
         indices_table = Table(indices_data, colWidths=[1.5*inch, 1*inch, 3*inch])
-        indices_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP')
-        ]))
+        indices_table.setStyle(self._indices_table_style)
         
         story.append(indices_table)
         story.append(Spacer(1, 20))
@@ -155,19 +268,19 @@ class ReportGenerator:
         # Environmental Impact Section
         story.append(Paragraph("Environmental Impact Assessment", self.styles['CustomHeading']))
         
-        impact = results['environmental_impact']
-        
-        impact_text = f"""
+        impact_parts = [f"""
         <b>Water Quality Score:</b> {impact['water_quality_score']:.1f}/10<br/>
         <b>Dissolved Oxygen Reduction:</b> {impact['dissolved_oxygen_reduction']:.1f}%<br/>
         <b>Fish Mortality Risk:</b> {impact['fish_mortality_risk']}<br/><br/>
         
         <b>Water Usability Assessment:</b><br/>
-        """
+        """]
         
         for use, status in impact['water_usability'].items():
             icon = "✓" if status == "Safe" else "⚠" if status == "Caution" else "✗"
-            impact_text += f"• {use}: {icon} {status}<br/>"
+            impact_parts.append(f"• {use}: {icon} {status}<br/>")
+        
+        impact_text = ''.join(impact_parts)
         
         story.append(Paragraph(impact_text, self.styles['CustomBody']))
         story.append(Spacer(1, 20))
@@ -176,19 +289,13 @@ class ReportGenerator:
         story.append(Paragraph("Mitigation Recommendations", self.styles['CustomHeading']))
         
         # This would be populated from mitigation_strategies.py
-        rec_text = "<b>Recommended Actions:</b><br/>"
-        rec_text += "• Monitor water quality regularly<br/>"
-        rec_text += "• Reduce nutrient inputs to waterbody<br/>"
-        rec_text += "• Consider professional water testing<br/>"
-        rec_text += "• Implement appropriate treatment measures<br/>"
-        
-        story.append(Paragraph(rec_text, self.styles['CustomBody']))
+        story.append(Paragraph(_RECOMMENDED_ACTIONS_HTML, self.styles['CustomBody']))
         story.append(Spacer(1, 20))
         
         # Footer
         footer_text = f"""
         <br/><br/>
-        <i>Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</i><br/>
+        <i>Report generated on {now.strftime('%Y-%m-%d %H:%M:%S')}</i><br/>
         <i>Algae Bloom Monitoring System - Uttarakhand Water Quality Initiative</i>
         """
         
@@ -196,22 +303,27 @@ class ReportGenerator:
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
-        
-        return buffer.getvalue()
     
-    def _generate_matplotlib_pdf(self, results: Dict[str, Any]) -> bytes:
-        """Generate PDF using matplotlib as fallback"""
+    def _generate_matplotlib_pdf(self, results: Dict[str, Any], out_stream: BinaryIO):
+        """Generate PDF using matplotlib as fallback, writing it to out_stream"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_pdf import PdfPages
         
-        buffer = io.BytesIO()
+        analysis_date = results.get('analysis_date', datetime.now().strftime('%Y-%m-%d'))
+        indices = self._normalize_indices(results['indices'], 'Normal')
+        risk = results['risk_assessment']
+        impact = results['environmental_impact']
         
-        with PdfPages(buffer) as pdf:
+        with PdfPages(out_stream, metadata={'Title': 'Algae Bloom Analysis Report'}) as pdf:
             # Page 1: Summary and Charts
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(11, 8))
+            # Figures are built with the object-oriented API: nothing is registered
+            # with pyplot, so no interactive backend is involved and nothing leaks
+            fig = Figure(figsize=(11, 8))
+            ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
             fig.suptitle('Algae Bloom Analysis Report', fontsize=16, fontweight='bold')
             
             # Risk assessment pie chart
-            risk_dist = results['environmental_impact'].get('risk_distribution', {
+            risk_dist = impact.get('risk_distribution', {
                 'Low Risk': 30, 'Medium Risk': 45, 'High Risk': 25
             })
             
@@ -220,28 +332,23 @@ class ReportGenerator:
             ax1.set_title('Risk Distribution')
             
             # Spectral indices bar chart
-            indices_names = []
-            indices_values = []
-            
-            for name, value in results['indices'].items():
-                if isinstance(value, dict):
-                    val = value.get('mean', 0)
-                else:
-                    val = value
-                
-                indices_names.append(name[:10])  # Truncate long names
-                indices_values.append(val)
+            indices_names = np.fromiter((row[0] for row in indices), dtype='U10', count=len(indices))  # Truncates long names
+            indices_values = np.fromiter((row[1] for row in indices), dtype=np.float64, count=len(indices))
             
-            ax2.bar(range(len(indices_names)), indices_values)
-            ax2.set_xticks(range(len(indices_names)))
+            bar_positions = np.arange(indices_values.size)
+            ax2.bar(bar_positions, indices_values)
+            ax2.set_xticks(bar_positions)
             ax2.set_xticklabels(indices_names, rotation=45, ha='right')
             ax2.set_title('Spectral Indices')
             ax2.set_ylabel('Value')
             
             # Temporal trend (if available)
             if 'temporal_data' in results:
-                temporal_df = pd.DataFrame(results['temporal_data'])
-                ax3.plot(pd.to_datetime(temporal_df['date']), temporal_df['algae_coverage'])
+                temporal_data = results['temporal_data']
+                dates = np.array([entry['date'] for entry in temporal_data], dtype='datetime64[ns]')
+                coverage = np.fromiter((entry['algae_coverage'] for entry in temporal_data),
+                                       dtype=np.float64, count=len(temporal_data))
+                ax3.plot(dates, coverage)
                 ax3.set_title('Algae Coverage Trend')
                 ax3.set_ylabel('Coverage %')
                 ax3.tick_params(axis='x', rotation=45)
@@ -254,26 +361,28 @@ class ReportGenerator:
             ax4.axis('off')
             summary_text = f"""
             Waterbody: {results.get('waterbody', 'Unknown')}
-            Analysis Date: {results.get('analysis_date', datetime.now().strftime('%Y-%m-%d'))}
+            Analysis Date: {analysis_date}
             
-            Risk Level: {results['risk_assessment']['risk_level']}
-            Risk Score: {results['risk_assessment']['risk_score']:.3f}
-            Algae Coverage: {results['risk_assessment']['algae_coverage_percent']:.1f}%
+            Risk Level: {risk['risk_level']}
+            Risk Score: {risk['risk_score']:.3f}
+            Algae Coverage: {risk['algae_coverage_percent']:.1f}%
             
-            Water Quality Score: {results['environmental_impact']['water_quality_score']:.1f}/10
-            DO Reduction: {results['environmental_impact']['dissolved_oxygen_reduction']:.1f}%
-            Fish Risk: {results['environmental_impact']['fish_mortality_risk']}
+            Water Quality Score: {impact['water_quality_score']:.1f}/10
+            DO Reduction: {impact['dissolved_oxygen_reduction']:.1f}%
+            Fish Risk: {impact['fish_mortality_risk']}
             """
             
             ax4.text(0.05, 0.95, summary_text, transform=ax4.transAxes, 
                     fontsize=10, verticalalignment='top', fontfamily='monospace')
             
-            plt.tight_layout()
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            # Fixed-size pages: the layout is tightened once here, so savefig
+            # needs no extra bbox_inches='tight' measuring pass
+            fig.tight_layout()
+            pdf.savefig(fig)
             
             # Page 2: Detailed Data Tables
-            fig, ax = plt.subplots(figsize=(11, 8))
+            fig = Figure(figsize=(11, 8))
+            ax = fig.subplots()
             ax.axis('tight')
             ax.axis('off')
             
@@ -282,18 +391,10 @@ class ReportGenerator:
             table_data.append(['Parameter', 'Value', 'Status'])
             
             # Add indices data
-            for name, value in results['indices'].items():
-                if isinstance(value, dict):
-                    val_str = f"{value.get('mean', 0):.4f}"
-                    status = value.get('interpretation', 'Normal')
-                else:
-                    val_str = f"{value:.4f}"
-                    status = self._interpret_index_value(name, value)
-                
-                table_data.append([name, val_str, status])
+            for name, value, status, _ in indices:
+                table_data.append([name, f"{value:.4f}", status])
             
             # Add environmental data
-            impact = results['environmental_impact']
             table_data.append(['Water Quality Score', f"{impact['water_quality_score']:.1f}/10", 
                              'Good' if impact['water_quality_score'] > 7 else 'Poor'])
             
@@ -311,11 +412,7 @@ class ReportGenerator:
             
             ax.set_title('Detailed Analysis Results', fontsize=14, fontweight='bold', pad=20)
             
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
-        
-        buffer.seek(0)
-        return buffer.getvalue()
+            pdf.savefig(fig)
     
     def generate_csv_export(self, results: Dict[str, Any]) -> str:
         """
@@ -328,128 +425,133 @@ class ReportGenerator:
             CSV data as string
         """
         
-        export_data = []
+        analysis_date = results.get('analysis_date', datetime.now().strftime('%Y-%m-%d'))
         
-        # Metadata
-        export_data.extend([
-            ['Section', 'Parameter', 'Value', 'Unit', 'Notes'],
-            ['Metadata', 'Waterbody', results.get('waterbody', ''), '', ''],
-            ['Metadata', 'Analysis Type', results.get('type', ''), '', ''],
-            ['Metadata', 'Analysis Date', results.get('analysis_date', datetime.now().strftime('%Y-%m-%d')), '', ''],
-            ['', '', '', '', '']  # Empty row
-        ])
+        # Metadata (rows are tuples: fixed size, nothing to grow)
+        export_data = [
+            ('Section', 'Parameter', 'Value', 'Unit', 'Notes'),
+            ('Metadata', 'Waterbody', results.get('waterbody', ''), '', ''),
+            ('Metadata', 'Analysis Type', results.get('type', ''), '', ''),
+            ('Metadata', 'Analysis Date', analysis_date, '', ''),
+            _EMPTY_CSV_ROW
+        ]
         
         # Risk Assessment
         risk = results['risk_assessment']
-        export_data.extend([
-            ['Risk Assessment', 'Risk Level', risk['risk_level'], '', ''],
-            ['Risk Assessment', 'Risk Score', f"{risk['risk_score']:.4f}", '0-1 scale', ''],
-            ['Risk Assessment', 'Algae Coverage', f"{risk['algae_coverage_percent']:.2f}", '%', ''],
-        ])
-        
-        export_data.append(['', '', '', '', ''])  # Empty row
+        export_data += (
+            ('Risk Assessment', 'Risk Level', risk['risk_level'], '', ''),
+            ('Risk Assessment', 'Risk Score', f"{risk['risk_score']:.4f}", '0-1 scale', ''),
+            ('Risk Assessment', 'Algae Coverage', f"{risk['algae_coverage_percent']:.2f}", '%', ''),
+            _EMPTY_CSV_ROW
+        )
         
         # Spectral Indices
-        for index, value in results['indices'].items():
-            if isinstance(value, dict):
-                val = value.get('mean', 0)
-                unit = value.get('unit', '')
-                interp = value.get('interpretation', '')
-            else:
-                val = value
-                unit = self._get_index_unit(index)
-                interp = self._interpret_index_value(index, val)
-            
-            export_data.append(['Spectral Indices', index, f"{val:.4f}", unit, interp])
+        export_data.extend(
+            ('Spectral Indices', index, f"{value:.4f}", unit, interp)
+            for index, value, interp, unit in self._normalize_indices(results['indices'])
+        )
         
-        export_data.append(['', '', '', '', ''])  # Empty row
+        export_data.append(_EMPTY_CSV_ROW)
         
         # Environmental Impact
         impact = results['environmental_impact']
-        export_data.extend([
-            ['Environmental Impact', 'Water Quality Score', f"{impact['water_quality_score']:.2f}", '0-10 scale', ''],
-            ['Environmental Impact', 'DO Reduction', f"{impact['dissolved_oxygen_reduction']:.2f}", '%', ''],
-            ['Environmental Impact', 'Fish Mortality Risk', impact['fish_mortality_risk'], 'Category', ''],
-        ])
+        export_data += (
+            ('Environmental Impact', 'Water Quality Score', f"{impact['water_quality_score']:.2f}", '0-10 scale', ''),
+            ('Environmental Impact', 'DO Reduction', f"{impact['dissolved_oxygen_reduction']:.2f}", '%', ''),
+            ('Environmental Impact', 'Fish Mortality Risk', impact['fish_mortality_risk'], 'Category', '')
+        )
         
         # Water Usability
-        for use, status in impact['water_usability'].items():
-            export_data.append(['Water Usability', use, status, 'Category', ''])
+        export_data.extend(
+            ('Water Usability', use, status, 'Category', '') for use, status in impact['water_usability'].items()
+        )
         
         # Temporal data if available
         if 'temporal_data' in results:
-            export_data.append(['', '', '', '', ''])  # Empty row
-            export_data.append(['Temporal Data', 'Date', 'Algae Coverage', 'Risk Score', ''])
-            
-            for entry in results['temporal_data']:
-                export_data.append([
-                    'Temporal Data',
-                    entry['date'],
-                    f"{entry['algae_coverage']:.2f}",
-                    f"{entry['risk_score']:.4f}",
-                    ''
-                ])
-        
-        # Convert to DataFrame and then CSV
-        df = pd.DataFrame(export_data)
+            export_data.append(_EMPTY_CSV_ROW)
+            export_data.append(('Temporal Data', 'Date', 'Algae Coverage', 'Risk Score', ''))
+            export_data.extend(
+                ('Temporal Data', entry['date'], f"{entry['algae_coverage']:.2f}", f"{entry['risk_score']:.4f}", '')
+                for entry in results['temporal_data']
+            )
+        
+        # Write the rows straight to CSV (no DataFrame needed for plain string rows)
         csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False, header=False)
+        writer = csv.writer(csv_buffer, lineterminator='\n')
+        writer.writerows(export_data)
         
         return csv_buffer.getvalue()
     
     def _interpret_index_value(self, index_name: str, value: float) -> str:
         """Interpret index values for reporting"""
         
-        if 'NDVI' in index_name:
-            if value > 0.6:
-                return "Dense vegetation/algae"
-            elif value > 0.3:
-                return "Moderate vegetation"
-            elif value > 0.1:
-                return "Sparse vegetation"
-            else:
-                return "Water/non-vegetated"
-                
-        elif 'NDWI' in index_name:
-            if value > 0.3:
-                return "Open water"
-            elif value > 0:
-                return "Wet areas"
-            else:
-                return "Dry/vegetated areas"
-                
-        elif 'Chlorophyll' in index_name:
-            if value > 30:
-                return "Very high - severe bloom"
-            elif value > 15:
-                return "High - bloom present"
-            elif value > 8:
-                return "Moderate levels"
-            else:
-                return "Low levels"
-                
-        elif 'Turbidity' in index_name:
-            if value > 40:
-                return "Very turbid"
-            elif value > 20:
-                return "Turbid"
-            elif value > 10:
-                return "Slightly turbid"
-            else:
-                return "Clear"
-                
-        elif 'FAI' in index_name:
-            if value > 0.015:
-                return "Dense floating algae"
-            elif value > 0.005:
-                return "Moderate floating algae"
-            elif value > 0:
-                return "Light algae presence"
-            else:
-                return "No floating algae"
+        for index_type, (thresholds, labels) in _INDEX_RULES.items():
+            if index_type in index_name:
+                # Count of thresholds strictly below value (bands are "value > threshold")
+                return labels[bisect.bisect_left(thresholds, value)]
         
         return "Normal range"
     
+    def _normalize_indices(self, indices: Dict[str, Any],
+                           missing_interpretation: str = '') -> List[Tuple[str, float, str, str]]:
+        """
+        Flatten an indices mapping into uniform rows
+        
+        Entries may be raw values or dicts carrying their own mean, interpretation
+        and unit; raw values are interpreted in one batch and get their unit from
+        the index name.
+        
+        Args:
+            indices: Mapping of index name to value or dict
+            missing_interpretation: Interpretation for dict entries that lack one
+            
+        Returns:
+            List of (name, value, interpretation, unit) tuples in input order
+        """
+        
+        raw_names = [name for name, value in indices.items() if not isinstance(value, dict)]
+        raw_interpretations = dict(zip(
+            raw_names, self._interpret_index_values(raw_names, [indices[name] for name in raw_names])
+        ))
+        
+        rows = []
+        for name, value in indices.items():
+            if isinstance(value, dict):
+                rows.append((name, value.get('mean', 0), value.get('interpretation', missing_interpretation),
+                             value.get('unit', '')))
+            else:
+                rows.append((name, value, raw_interpretations[name], self._get_index_unit(name)))
+        
+        return rows
+    
+    def _interpret_index_values(self, index_names: List[str], values) -> List[str]:
+        """
+        Batch version of _interpret_index_value
+        
+        Args:
+            index_names: Index names
+            values: Index values aligned with index_names
+            
+        Returns:
+            List of interpretations aligned with index_names
+        """
+        
+        codes = np.fromiter((_index_type_code(name) for name in index_names), dtype=np.int8, count=len(index_names))
+        values = np.asarray(values, dtype=np.float64)
+        interpretations = ["Normal range"] * len(index_names)
+        
+        for code, (thresholds, labels) in enumerate(_INDEX_RULES.values()):
+            rows = np.flatnonzero(codes == code)
+            if not rows.size:
+                continue
+            # Same band as bisect_left; NaN fails every "value > threshold" test
+            bands = np.searchsorted(thresholds, values[rows], side='left')
+            bands[np.isnan(values[rows])] = 0
+            for row, band in zip(rows.tolist(), bands.tolist()):
+                interpretations[row] = labels[band]
+        
+        return interpretations
+    
     def _get_index_unit(self, index_name: str) -> str:
         """Get units for different indices"""
         
@@ -473,57 +575,58 @@ class ReportGenerator:
             Executive summary as formatted string
         """
         
-        risk_level = results['risk_assessment']['risk_level']
-        coverage = results['risk_assessment']['algae_coverage_percent']
+        risk = results['risk_assessment']
+        impact = results['environmental_impact']
+        risk_level = risk['risk_level']
+        coverage = risk['algae_coverage_percent']
         waterbody = results.get('waterbody', 'the analyzed waterbody')
+        now = datetime.now()
+        analysis_date = results.get('analysis_date', now.strftime('%Y-%m-%d'))
         
-        summary = f"""
+        summary_parts = [f"""
         EXECUTIVE SUMMARY - ALGAE BLOOM ANALYSIS
         
         Waterbody: {waterbody}
-        Analysis Date: {results.get('analysis_date', datetime.now().strftime('%Y-%m-%d'))}
+        Analysis Date: {analysis_date}
         
         KEY FINDINGS:
         • Risk Level: {risk_level}
         • Algae Coverage: {coverage:.1f}%
-        • Water Quality Score: {results['environmental_impact']['water_quality_score']:.1f}/10
+        • Water Quality Score: {impact['water_quality_score']:.1f}/10
         
         ENVIRONMENTAL IMPACT:
-        • Dissolved Oxygen Reduction: {results['environmental_impact']['dissolved_oxygen_reduction']:.1f}%
-        • Fish Mortality Risk: {results['environmental_impact']['fish_mortality_risk']}
+        • Dissolved Oxygen Reduction: {impact['dissolved_oxygen_reduction']:.1f}%
+        • Fish Mortality Risk: {impact['fish_mortality_risk']}
         
         IMMEDIATE ACTIONS REQUIRED:
-        """
+        """]
         
         # Add risk-specific recommendations
-        if risk_level == "High":
-            summary += """
-        • URGENT: Restrict water contact and usage
-        • Implement emergency treatment measures
-        • Notify relevant authorities and communities
-        • Begin intensive monitoring program
-            """
-        elif risk_level == "Medium":
-            summary += """
-        • Increase monitoring frequency
-        • Implement preventive measures
-        • Reduce nutrient inputs to waterbody
-        • Consider water treatment options
-            """
-        else:
-            summary += """
-        • Continue regular monitoring
-        • Maintain current management practices
-        • Monitor for seasonal changes
-            """
+        summary_parts.append(_SUMMARY_ACTION_BLOCKS.get(risk_level, _SUMMARY_ACTION_BLOCKS["Low"]))
         
-        summary += f"""
+        summary_parts.append(f"""
         
         This analysis was conducted using satellite imagery and spectral analysis techniques.
         For detailed results and technical data, please refer to the complete report.
         
-        Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}
+        """)
+        
+        return ''.join(summary_parts)
+    
+    @staticmethod
+    def save_bytes(path: str, data: Union[bytes, str]):
+        """
+        Persist a generated report (PDF bytes or CSV/summary text) to disk
+        
+        Args:
+            path: Destination file path (overwritten if it exists)
+            data: Report content; text is written as UTF-8
         """
         
-        return summary
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        with open(path, 'wb', buffering=_SAVE_BUFFER_SIZE) as f:
+            f.write(data)
 
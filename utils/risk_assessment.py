@@ -4,47 +4,259 @@ Evaluates algae bloom risks and environmental impacts using scientific formulas
 """
 
 import numpy as np
-from typing import Dict, Any, List
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
 import math
 from datetime import datetime, timedelta
-from utils.scientific_formulas import ScientificAlgaeMetrics
+
+# Optional JIT compilation of the per-pixel risk map kernel
+try:
+    from numba import njit, prange, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Month-indexed seasonal lookups (index 0 unused): risk multiplier and label
+_SEASON_MULT = (0.0, 0.8, 0.8, 0.8, 1.0, 1.0, 1.2, 1.2, 1.2, 1.2, 1.0, 0.8, 0.8)
+_SEASON_LABEL = (
+    "",
+    "Low (Winter)", "Low (Winter)", "Low (Winter)",
+    "Medium (Spring/Fall)", "Medium (Spring/Fall)",
+    "High (Summer)", "High (Summer)", "High (Summer)",
+    "Medium (Spring/Fall)", "Medium (Spring/Fall)",
+    "Low (Winter)", "Low (Winter)"
+)
+
+_SEASON_MULT_ARR = np.array(_SEASON_MULT)
+
+# Months flagged by the risk factor checks
+_PEAK_SEASON = frozenset({6, 7, 8, 9})
+_HOT_MONTHS = frozenset({7, 8})
+
+# Risk level bands: a score at a cut falls in the upper level. A NaN score is
+# "Minimal" everywhere (scalar, batch and image paths), since it fails every ">=" cut
+_RISK_CUTS = (0.2, 0.5, 0.8)
+_RISK_LABELS = ("Minimal", "Low", "Medium", "High")
+_RISK_LABELS_ARR = np.array(_RISK_LABELS)
+
+def _risk_level_indices(risk_scores: np.ndarray) -> np.ndarray:
+    """Index into _RISK_LABELS for each score (NaN maps to Minimal)"""
+    levels = np.searchsorted(_RISK_CUTS, risk_scores, side='right')
+    levels[np.isnan(risk_scores)] = 0
+    return levels
+
+def _frozen_array(values) -> np.ndarray:
+    """Read-only float64 array (safe to share between instances)"""
+    array = np.array(list(values), dtype=np.float64)
+    array.setflags(write=False)
+    return array
+
+def _score_bands(values, thresholds: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Score values against ascending ">=" thresholds with one searchsorted lookup
+    
+    Args:
+        values: Scalar or array of parameter values
+        thresholds: Ascending band thresholds (a value at a threshold falls in the upper band)
+        scores: Score per band, one more entry than thresholds
+        
+    Returns:
+        Array of scores shaped like values (NaN scores as the lowest band)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    bands = np.searchsorted(thresholds, values, side='right')
+    bands = np.where(np.isnan(values), 0, bands)
+    return scores[bands]
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _band_score(value, thresholds, scores):
+        """Score of the band a value falls in (NaN fails every ">=" test)"""
+        band = 0
+        for k in range(thresholds.shape[0]):
+            if value >= thresholds[k]:
+                band = k + 1
+        return scores[band]
+    
+    # Explicit signature: compiled (or loaded from the cache) at import, not on first
+    # call. Rasters are C-contiguous float32; the threshold/score tables are the
+    # read-only class-level arrays.
+    _RASTER = types.float32[:, ::1]
+    _TABLE = types.Array(types.float64, 1, 'C', readonly=True)
+    
+    @njit(_RASTER(_RASTER, _RASTER, _RASTER, _RASTER, _RASTER, _TABLE, _TABLE, _TABLE, _TABLE, _TABLE, _TABLE),
+          parallel=True, cache=True)
+    def _risk_map_kernel(chl, turb, fai, ndvi, ndwi, chl_thr, chl_scores, turb_thr, turb_scores,
+                         fai_thr, fai_scores):
+        """Combined weighted risk per pixel in one fused pass over the index rasters"""
+        risk_map = np.empty(chl.shape, dtype=np.float32)
+        for i in prange(chl.shape[0]):
+            for j in range(chl.shape[1]):
+                if ndwi[i, j] > 0:
+                    if ndvi[i, j] > 0.4:
+                        vegetation_risk = 0.8
+                    elif ndvi[i, j] > 0.2:
+                        vegetation_risk = 0.4
+                    else:
+                        vegetation_risk = 0.1
+                else:
+                    vegetation_risk = ndvi[i, j] * 0.2
+                    if not vegetation_risk > 0:
+                        vegetation_risk = 0.0
+                risk_map[i, j] = (
+                    _band_score(chl[i, j], chl_thr, chl_scores) * 0.35 +
+                    _band_score(fai[i, j], fai_thr, fai_scores) * 0.25 +
+                    _band_score(turb[i, j], turb_thr, turb_scores) * 0.20 +
+                    vegetation_risk * 0.20
+                )
+        return risk_map
+    
+    @njit(cache=True)
+    def _coverage_value(fai, ndvi, chl_a):
+        """ScientificAlgaeMetrics.calculate_algae_coverage_combined for one pixel"""
+        if chl_a < 3:
+            coverage = 0.0
+        elif chl_a < 10:
+            coverage = 5.0 + (chl_a - 3) * 2.0
+        elif chl_a < 30:
+            coverage = 20.0 + (chl_a - 10) * 1.5
+        elif chl_a < 100:
+            coverage = 50.0 + (chl_a - 30) * 0.5
+        else:
+            excess = (chl_a - 100) * 0.1
+            coverage = 85.0 + (excess if excess < 15.0 else 15.0)  # NaN Chl-a saturates at 100%
+        
+        if fai > 0.15:
+            coverage += 10.0
+        elif fai > 0.10:
+            coverage += 5.0
+        elif fai > 0.05:
+            coverage += 2.0
+        
+        if ndvi > 0.4:
+            coverage += 5.0
+        elif ndvi > 0.2:
+            coverage += 2.0
+        
+        return min(100.0, max(0.0, coverage))
+    
+    @njit(_RASTER(_RASTER, _RASTER, _RASTER), parallel=True, cache=True)
+    def _algae_coverage_kernel(fai, ndvi, chl):
+        """Estimated algae coverage percent per pixel"""
+        coverage_map = np.empty(chl.shape, dtype=np.float32)
+        for i in prange(chl.shape[0]):
+            for j in range(chl.shape[1]):
+                coverage_map[i, j] = _coverage_value(fai[i, j], ndvi[i, j], chl[i, j])
+        return coverage_map
+
+def _img_risk_core(algae_coverage, detection_confidence, chl_a, turbidity):
+    """
+    Numeric core of the image-based risk assessment
+    
+    Returns:
+        Tuple of (adjusted_risk, coverage_risk, quality_risk, confidence_factor,
+        risk level index into _RISK_LABELS)
+    """
+    coverage_risk = algae_coverage / 50.0  # Scale to 0-1
+    if not coverage_risk < 1.0:
+        coverage_risk = 1.0
+    quality_risk = (chl_a / 100.0 + turbidity / 100.0) / 2
+    
+    confidence_factor = detection_confidence / 100.0
+    adjusted_risk = (coverage_risk * 0.6 + quality_risk * 0.4) * confidence_factor
+    
+    # Same ">=" cuts as _RISK_CUTS; NaN falls through to Minimal
+    if adjusted_risk >= 0.8:
+        level = 3
+    elif adjusted_risk >= 0.5:
+        level = 2
+    elif adjusted_risk >= 0.2:
+        level = 1
+    else:
+        level = 0
+    return adjusted_risk, coverage_risk, quality_risk, confidence_factor, level
+
+if NUMBA_AVAILABLE:
+    _img_risk_core = njit(cache=True)(_img_risk_core)
+
+@lru_cache(maxsize=128)
+def _confidence_core(available_indices: int, unrealistic_values: bool) -> float:
+    """Assessment confidence (20-100%) from the available index count and a data quality flag"""
+    max_indices = 5  # NDVI, NDWI, Chl-a, Turbidity, FAI
+    
+    data_completeness = available_indices / max_indices
+    data_quality = 0.5 if unrealistic_values else 1.0
+    
+    # Calculate overall confidence
+    confidence = (data_completeness * 0.6 + data_quality * 0.4) * 100
+    
+    return max(20, min(100, confidence))  # Keep between 20-100%
 
 class RiskAssessment:
     """Risk assessment calculator for algae blooms"""
     
+    # Risk thresholds for different parameters (class-level, read-only: shared by
+    # every instance instead of being rebuilt per assessment object)
+    chlorophyll_thresholds = MappingProxyType({
+        'low': 5.0,      # μg/L
+        'medium': 15.0,   # μg/L
+        'high': 30.0,     # μg/L
+        'severe': 50.0    # μg/L
+    })
+    
+    turbidity_thresholds = MappingProxyType({
+        'low': 10.0,      # NTU
+        'medium': 25.0,   # NTU  
+        'high': 50.0,     # NTU
+        'severe': 100.0   # NTU
+    })
+    
+    fai_thresholds = MappingProxyType({
+        'low': 0.001,
+        'medium': 0.005,
+        'high': 0.015,
+        'severe': 0.030
+    })
+    
+    # 'medium' thresholds used by the risk factor checks
+    _CHL_MED = chlorophyll_thresholds['medium']
+    _TURB_MED = turbidity_thresholds['medium']
+    _FAI_MED = fai_thresholds['medium']
+    
+    # Threshold/score lookup tables for the parameter risk scores
+    _chl_thr = _frozen_array(chlorophyll_thresholds.values())
+    _chl_scores = _frozen_array([0.0, 0.2, 0.5, 0.8, 1.0])
+    _turb_thr = _frozen_array(turbidity_thresholds.values())
+    _turb_scores = _frozen_array([0.0, 0.1, 0.4, 0.7, 1.0])
+    _fai_thr = _frozen_array(fai_thresholds.values())
+    _fai_scores = _frozen_array([0.0, 0.2, 0.5, 0.8, 1.0])
+    
+    # Shared scientific metrics calculator, created on first use
+    _metrics_instance = None
+    
     def __init__(self):
-        """Initialize risk assessment thresholds and parameters"""
-        
-        # Initialize scientific metrics calculator
-        self.scientific_metrics = ScientificAlgaeMetrics()
-        
-        # Risk thresholds for different parameters
-        self.chlorophyll_thresholds = {
-            'low': 5.0,      # μg/L
-            'medium': 15.0,   # μg/L
-            'high': 30.0,     # μg/L
-            'severe': 50.0    # μg/L
-        }
-        
-        self.turbidity_thresholds = {
-            'low': 10.0,      # NTU
-            'medium': 25.0,   # NTU  
-            'high': 50.0,     # NTU
-            'severe': 100.0   # NTU
-        }
-        
-        self.fai_thresholds = {
-            'low': 0.001,
-            'medium': 0.005,
-            'high': 0.015,
-            'severe': 0.030
-        }
+        """Initialize risk assessment parameters"""
         
         # Environmental impact factors
         self.temperature_factor = 1.0  # Multiplier for temperature effects
         self.nutrient_factor = 1.0     # Multiplier for nutrient loading
         self.seasonal_factor = 1.0     # Seasonal variation factor
     
+    @classmethod
+    def _metrics(cls):
+        """Shared ScientificAlgaeMetrics instance (stateless, so one serves all assessments)"""
+        if cls._metrics_instance is None:
+            from utils.scientific_formulas import ScientificAlgaeMetrics
+            cls._metrics_instance = ScientificAlgaeMetrics()
+        return cls._metrics_instance
+    
+    @property
+    def scientific_metrics(self):
+        """Scientific metrics calculator"""
+        return self._metrics()
+    
     def assess_algae_risk(self, spectral_indices: Dict[str, Any], imagery_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Comprehensive algae bloom risk assessment
@@ -57,6 +269,9 @@ class RiskAssessment:
             Dictionary containing comprehensive risk assessment
         """
         
+        # One clock read per assessment, shared by the seasonal helpers
+        now = datetime.now()
+        
         # Extract key parameters
         chl_a = self._extract_value(spectral_indices.get('Chlorophyll-a', {}))
         turbidity = self._extract_value(spectral_indices.get('Turbidity', {}))
@@ -82,7 +297,7 @@ class RiskAssessment:
         
         # Apply environmental factors
         adjusted_risk_score = self._apply_environmental_factors(
-            combined_risk_score, imagery_data
+            combined_risk_score, imagery_data, now.month
         )
         
         # Calculate algae coverage percentage
@@ -102,9 +317,105 @@ class RiskAssessment:
                 'floating_algae': fai_risk,
                 'vegetation': vegetation_risk
             },
-            'risk_factors': self._identify_risk_factors(chl_a, turbidity, fai, ndvi),
-            'confidence_level': self._calculate_confidence(spectral_indices),
-            'environmental_conditions': self._assess_environmental_conditions(imagery_data)
+            'risk_factors': self._identify_risk_factors(chl_a, turbidity, fai, ndvi, now.month),
+            'confidence_level': self._calculate_confidence(spectral_indices, chl_a, turbidity),
+            'environmental_conditions': self._assess_environmental_conditions(imagery_data, now)
+        }
+    
+    def assess_algae_risk_map(self, chl_a: np.ndarray, turbidity: np.ndarray, fai: np.ndarray,
+                              ndvi: np.ndarray, ndwi: np.ndarray) -> Dict[str, Any]:
+        """
+        Per-pixel algae risk from spectral index rasters
+        
+        Uses the same weighted combination as assess_algae_risk, without the
+        seasonal and cloud-cover adjustments (those apply to a whole scene).
+        
+        Args:
+            chl_a: Chlorophyll-a raster (μg/L)
+            turbidity: Turbidity raster (NTU)
+            fai: Floating Algae Index raster
+            ndvi: NDVI raster
+            ndwi: NDWI raster
+            
+        Returns:
+            Dictionary with the float32 'risk_map' and its 'mean_risk'
+        """
+        
+        rasters = [np.require(raster, np.float32, ['C', 'W']) for raster in (chl_a, turbidity, fai, ndvi, ndwi)]
+        if rasters[0].ndim != 2 or any(raster.shape != rasters[0].shape for raster in rasters):
+            raise ValueError("Index rasters must be 2-D arrays of the same shape")
+        chl_a, turbidity, fai, ndvi, ndwi = rasters
+        
+        if NUMBA_AVAILABLE:
+            risk_map = _risk_map_kernel(
+                chl_a, turbidity, fai, ndvi, ndwi,
+                self._chl_thr, self._chl_scores, self._turb_thr, self._turb_scores,
+                self._fai_thr, self._fai_scores
+            )
+        else:
+            risk_map = (
+                self._calculate_chlorophyll_risk_vec(chl_a) * 0.35 +
+                self._calculate_fai_risk_vec(fai) * 0.25 +
+                self._calculate_turbidity_risk_vec(turbidity) * 0.20 +
+                self._calculate_vegetation_risk_vec(ndvi, ndwi) * 0.20
+            ).astype(np.float32)
+        
+        return {
+            'risk_map': risk_map,
+            'mean_risk': float(risk_map.mean()) if risk_map.size else 0.0
+        }
+    
+    def assess_algae_risk_batch(self, chl_a: np.ndarray, turbidity: np.ndarray, fai: np.ndarray,
+                                ndvi: np.ndarray, ndwi: np.ndarray, months: np.ndarray,
+                                cloud_cover: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Risk assessment for many tiles at once, one array per parameter
+        
+        Applies the same scoring, seasonal and cloud-cover adjustments as
+        assess_algae_risk, with vector operations instead of a per-tile call.
+        
+        Args:
+            chl_a: Chlorophyll-a per tile (μg/L)
+            turbidity: Turbidity per tile (NTU)
+            fai: Floating Algae Index per tile
+            ndvi: NDVI per tile
+            ndwi: NDWI per tile
+            months: Month (1-12) each tile was assessed in; other values raise ValueError
+            cloud_cover: Cloud cover percent per tile
+            
+        Returns:
+            Dictionary of per-tile arrays: risk_score, risk_level and the
+            individual chlorophyll/turbidity/floating_algae/vegetation risks
+        """
+        
+        months = np.asarray(months)
+        if months.size and not (np.all(months == np.floor(months)) and months.min() >= 1 and months.max() <= 12):
+            raise ValueError("months must be integer month numbers between 1 and 12")
+        
+        chl_risk = self._calculate_chlorophyll_risk_vec(chl_a)
+        turbidity_risk = self._calculate_turbidity_risk_vec(turbidity)
+        fai_risk = self._calculate_fai_risk_vec(fai)
+        vegetation_risk = self._calculate_vegetation_risk_vec(ndvi, ndwi)
+        
+        risk_score = (
+            chl_risk * 0.35 +
+            fai_risk * 0.25 +
+            turbidity_risk * 0.20 +
+            vegetation_risk * 0.20
+        )
+        
+        # Seasonal and cloud-cover adjustments, then clamp to [0, 1]
+        risk_score *= _SEASON_MULT_ARR[months.astype(np.intp)]
+        risk_score *= np.where(np.asarray(cloud_cover) > 50, 0.8, 1.0)
+        np.clip(risk_score, 0.0, 1.0, out=risk_score)
+        
+        return {
+            'risk_score': risk_score,
+            'risk_level': _RISK_LABELS_ARR[_risk_level_indices(risk_score)],
+            'chlorophyll': chl_risk,
+            'turbidity': turbidity_risk,
+            'floating_algae': fai_risk,
+            'vegetation': vegetation_risk
         }
     
     def assess_algae_risk_from_image(self, image_results: Dict[str, Any], indices: Dict[str, float]) -> Dict[str, Any]:
@@ -128,23 +439,14 @@ class RiskAssessment:
         chl_a = quality_metrics.get('estimated_chlorophyll', indices.get('Chlorophyll-a', 0))
         turbidity = quality_metrics.get('estimated_turbidity', indices.get('Turbidity', 0))
         
-        # Calculate risk based on coverage and quality metrics
-        coverage_risk = min(1.0, algae_coverage / 50.0)  # Scale to 0-1
-        quality_risk = (chl_a / 100.0 + turbidity / 100.0) / 2
-        
-        # Combine risks
-        combined_risk = (coverage_risk * 0.6 + quality_risk * 0.4)
-        
-        # Adjust for detection confidence
-        confidence_factor = detection_confidence / 100.0
-        adjusted_risk = combined_risk * confidence_factor
-        
-        # Determine risk level
-        risk_level = self._determine_risk_level(adjusted_risk)
+        # Coverage/quality risks combined and scaled by detection confidence
+        adjusted_risk, coverage_risk, quality_risk, confidence_factor, level = _img_risk_core(
+            float(algae_coverage), float(detection_confidence), float(chl_a), float(turbidity)
+        )
         
         return {
             'risk_score': adjusted_risk,
-            'risk_level': risk_level,
+            'risk_level': _RISK_LABELS[level],
             'algae_coverage_percent': algae_coverage,
             'individual_risks': {
                 'visual_coverage': coverage_risk,
@@ -158,6 +460,16 @@ class RiskAssessment:
     def _extract_value(self, parameter: Any) -> float:
         """Extract numeric value from parameter dictionary or direct value"""
         
+        # Fast paths for the common exact types; subclasses take the general checks below
+        kind = type(parameter)
+        if kind is dict:
+            try:
+                return parameter['mean']
+            except KeyError:
+                return parameter.get('value', 0)
+        if kind is float:
+            return parameter
+        
         if isinstance(parameter, dict):
             return parameter.get('mean', parameter.get('value', 0))
         elif isinstance(parameter, (int, float)):
@@ -167,45 +479,27 @@ class RiskAssessment:
     
     def _calculate_chlorophyll_risk(self, chl_a: float) -> float:
         """Calculate risk score based on chlorophyll-a concentration"""
-        
-        if chl_a >= self.chlorophyll_thresholds['severe']:
-            return 1.0
-        elif chl_a >= self.chlorophyll_thresholds['high']:
-            return 0.8
-        elif chl_a >= self.chlorophyll_thresholds['medium']:
-            return 0.5
-        elif chl_a >= self.chlorophyll_thresholds['low']:
-            return 0.2
-        else:
-            return 0.0
+        return float(self._calculate_chlorophyll_risk_vec(chl_a))
+    
+    def _calculate_chlorophyll_risk_vec(self, chl_a: np.ndarray) -> np.ndarray:
+        """Chlorophyll-a risk scores for a whole array (e.g. a raster)"""
+        return _score_bands(chl_a, self._chl_thr, self._chl_scores)
     
     def _calculate_turbidity_risk(self, turbidity: float) -> float:
         """Calculate risk score based on turbidity"""
-        
-        if turbidity >= self.turbidity_thresholds['severe']:
-            return 1.0
-        elif turbidity >= self.turbidity_thresholds['high']:
-            return 0.7
-        elif turbidity >= self.turbidity_thresholds['medium']:
-            return 0.4
-        elif turbidity >= self.turbidity_thresholds['low']:
-            return 0.1
-        else:
-            return 0.0
+        return float(self._calculate_turbidity_risk_vec(turbidity))
+    
+    def _calculate_turbidity_risk_vec(self, turbidity: np.ndarray) -> np.ndarray:
+        """Turbidity risk scores for a whole array (e.g. a raster)"""
+        return _score_bands(turbidity, self._turb_thr, self._turb_scores)
     
     def _calculate_fai_risk(self, fai: float) -> float:
         """Calculate risk score based on Floating Algae Index"""
-        
-        if fai >= self.fai_thresholds['severe']:
-            return 1.0
-        elif fai >= self.fai_thresholds['high']:
-            return 0.8
-        elif fai >= self.fai_thresholds['medium']:
-            return 0.5
-        elif fai >= self.fai_thresholds['low']:
-            return 0.2
-        else:
-            return 0.0
+        return float(self._calculate_fai_risk_vec(fai))
+    
+    def _calculate_fai_risk_vec(self, fai: np.ndarray) -> np.ndarray:
+        """Floating Algae Index risk scores for a whole array (e.g. a raster)"""
+        return _score_bands(fai, self._fai_thr, self._fai_scores)
     
     def _calculate_vegetation_risk(self, ndvi: float, ndwi: float) -> float:
         """Calculate risk based on vegetation indices over water"""
@@ -222,19 +516,24 @@ class RiskAssessment:
             # Not over water, lower risk
             return max(0, ndvi * 0.2)
     
-    def _apply_environmental_factors(self, base_risk: float, imagery_data: Dict[str, Any]) -> float:
+    def _calculate_vegetation_risk_vec(self, ndvi: np.ndarray, ndwi: np.ndarray) -> np.ndarray:
+        """Vegetation risk for whole arrays (e.g. rasters)"""
+        ndvi = np.asarray(ndvi, dtype=np.float64)
+        over_water = np.select([ndvi > 0.4, ndvi > 0.2], [0.8, 0.4], 0.1)
+        off_water = ndvi * 0.2
+        off_water = np.where(off_water > 0, off_water, 0.0)  # NaN counts as no risk
+        return np.where(np.asarray(ndwi) > 0, over_water, off_water)
+    
+    def _apply_environmental_factors(self, base_risk: float, imagery_data: Dict[str, Any],
+                                     current_month: Optional[int] = None) -> float:
         """Apply environmental factors to adjust risk score"""
         
-        adjusted_risk = base_risk
+        if current_month is None:
+            current_month = datetime.now().month
         
-        # Seasonal factor (summer months higher risk)
-        current_month = datetime.now().month
-        if current_month in [6, 7, 8, 9]:  # Summer/early fall
-            adjusted_risk *= 1.2
-        elif current_month in [4, 5, 10]:  # Spring/late fall
-            adjusted_risk *= 1.0
-        else:  # Winter
-            adjusted_risk *= 0.8
+        # Seasonal factor: 1.2 in summer/early fall (Jun-Sep), 1.0 in spring/late
+        # fall (Apr, May, Oct), 0.8 in winter
+        adjusted_risk = base_risk * _SEASON_MULT[current_month]
         
         # Cloud cover factor (less reliable data with high clouds)
         cloud_cover = imagery_data.get('metadata', {}).get('cloud_cover', 20)
@@ -251,84 +550,106 @@ class RiskAssessment:
         Reference: Garcia et al. (2013), Hu (2009) - FAI threshold method
         """
         # Use scientific formula from research papers
-        coverage = self.scientific_metrics.calculate_algae_coverage_combined(fai, ndvi, chl_a)
+        coverage = self._metrics().calculate_algae_coverage_combined(fai, ndvi, chl_a)
         return coverage
     
+    def estimate_algae_coverage_map(self, chl_a: np.ndarray, fai: np.ndarray, ndvi: np.ndarray) -> np.ndarray:
+        """
+        Per-pixel algae coverage estimate from index rasters
+        
+        Applies the same multi-index formula as _estimate_algae_coverage to
+        every pixel.
+        
+        Args:
+            chl_a: Chlorophyll-a raster (μg/L)
+            fai: Floating Algae Index raster
+            ndvi: NDVI raster
+            
+        Returns:
+            float32 raster of estimated coverage percent (0-100)
+        """
+        
+        rasters = [np.require(raster, np.float32, ['C', 'W']) for raster in (chl_a, fai, ndvi)]
+        if rasters[0].ndim != 2 or any(raster.shape != rasters[0].shape for raster in rasters):
+            raise ValueError("Index rasters must be 2-D arrays of the same shape")
+        chl_a, fai, ndvi = rasters
+        
+        if NUMBA_AVAILABLE:
+            return _algae_coverage_kernel(fai, ndvi, chl_a)
+        
+        # Compare in float64 like the scalar formula (float32 0.15 > 0.15 there)
+        chl, fai, ndvi = (raster.astype(np.float64) for raster in rasters)
+        coverage = np.select(
+            [chl < 3, chl < 10, chl < 30, chl < 100],
+            [0.0, 5.0 + (chl - 3) * 2.0, 20.0 + (chl - 10) * 1.5, 50.0 + (chl - 30) * 0.5],
+            85.0 + np.fmin(15.0, (chl - 100) * 0.1)
+        )
+        coverage += np.select([fai > 0.15, fai > 0.10, fai > 0.05], [10.0, 5.0, 2.0], 0.0)
+        coverage += np.select([ndvi > 0.4, ndvi > 0.2], [5.0, 2.0], 0.0)
+        return np.clip(coverage, 0.0, 100.0).astype(np.float32)
+    
     def _determine_risk_level(self, risk_score: float) -> str:
         """Determine categorical risk level from numeric score"""
         
-        if risk_score >= 0.8:
-            return "High"
-        elif risk_score >= 0.5:
-            return "Medium"
-        elif risk_score >= 0.2:
-            return "Low"
-        else:
-            return "Minimal"
+        if math.isnan(risk_score):
+            return _RISK_LABELS[0]  # bisect would place NaN above every cut
+        return _RISK_LABELS[bisect_right(_RISK_CUTS, risk_score)]
     
-    def _identify_risk_factors(self, chl_a: float, turbidity: float, fai: float, ndvi: float) -> List[str]:
+    def _identify_risk_factors(self, chl_a: float, turbidity: float, fai: float, ndvi: float,
+                               current_month: Optional[int] = None) -> List[str]:
         """Identify key risk factors contributing to algae risk"""
         
         factors = []
         
-        if chl_a > self.chlorophyll_thresholds['medium']:
+        if chl_a > self._CHL_MED:
             factors.append("Elevated chlorophyll-a levels")
         
-        if turbidity > self.turbidity_thresholds['medium']:
+        if turbidity > self._TURB_MED:
             factors.append("High water turbidity")
         
-        if fai > self.fai_thresholds['medium']:
+        if fai > self._FAI_MED:
             factors.append("Significant floating algae presence")
         
         if ndvi > 0.3:
             factors.append("High vegetation index over water")
         
         # Seasonal factors
-        current_month = datetime.now().month
-        if current_month in [6, 7, 8, 9]:
+        if current_month is None:
+            current_month = datetime.now().month
+        if current_month in _PEAK_SEASON:
             factors.append("Peak algae season (summer/early fall)")
         
         # Temperature factor (estimated)
-        if current_month in [7, 8]:
+        if current_month in _HOT_MONTHS:
             factors.append("High temperature conditions")
         
         return factors if factors else ["No significant risk factors identified"]
     
-    def _calculate_confidence(self, spectral_indices: Dict[str, Any]) -> float:
-        """Calculate confidence level of the assessment"""
+    def _calculate_confidence(self, spectral_indices: Dict[str, Any], chl_a: Optional[float] = None,
+                              turbidity: Optional[float] = None) -> float:
+        """Calculate confidence level of the assessment (pass chl_a/turbidity if already extracted)"""
         
         # Base confidence on data availability and quality
-        available_indices = len([k for k, v in spectral_indices.items() if v])
-        max_indices = 5  # NDVI, NDWI, Chl-a, Turbidity, FAI
-        
-        data_completeness = available_indices / max_indices
+        available_indices = sum(1 for v in spectral_indices.values() if v)
         
         # Check if data appears realistic
-        chl_a = self._extract_value(spectral_indices.get('Chlorophyll-a', {}))
-        turbidity = self._extract_value(spectral_indices.get('Turbidity', {}))
+        if chl_a is None:
+            chl_a = self._extract_value(spectral_indices.get('Chlorophyll-a', {}))
+        if turbidity is None:
+            turbidity = self._extract_value(spectral_indices.get('Turbidity', {}))
         
-        data_quality = 1.0
-        if chl_a > 200 or turbidity > 200:  # Unrealistic values
-            data_quality = 0.5
-        
-        # Calculate overall confidence
-        confidence = (data_completeness * 0.6 + data_quality * 0.4) * 100
-        
-        return max(20, min(100, confidence))  # Keep between 20-100%
+        return _confidence_core(available_indices, bool(chl_a > 200 or turbidity > 200))
     
-    def _assess_environmental_conditions(self, imagery_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_environmental_conditions(self, imagery_data: Dict[str, Any],
+                                         now: Optional[datetime] = None) -> Dict[str, Any]:
         """Assess environmental conditions affecting algae growth"""
         
         metadata = imagery_data.get('metadata', {})
+        if now is None:
+            now = datetime.now()
         
         # Assess season
-        current_month = datetime.now().month
-        if current_month in [6, 7, 8]:
-            season_risk = "High (Summer)"
-        elif current_month in [4, 5, 9, 10]:
-            season_risk = "Medium (Spring/Fall)"
-        else:
-            season_risk = "Low (Winter)"
+        season_risk = _SEASON_LABEL[now.month]
         
         # Assess data quality
         cloud_cover = metadata.get('cloud_cover', 20)
@@ -345,7 +666,7 @@ class RiskAssessment:
             'seasonal_risk': season_risk,
             'data_quality': data_quality,
             'cloud_cover_percent': cloud_cover,
-            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
+            'analysis_date': now.strftime('%Y-%m-%d'),
             'satellite_platform': metadata.get('satellite', 'Unknown')
         }
     